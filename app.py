@@ -2,15 +2,24 @@
 Main Flask application for QA Test Plan automation.
 Listens for Jira webhook events and creates Google Sheets accordingly.
 """
+import atexit
 import logging
+import re
 import sys
-from flask import Flask, request, jsonify
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import orjson
+from flask import Flask, request
+from flask.json.provider import JSONProvider
 
 from config import Config
 from google_sheets import GoogleSheetsManager
-from jira_client import JiraClient
+from jira_client import JiraClient, QA_PLAN_COMMENT_PREFIX, QA_PLAN_FIELDS
 from jira_parser import JiraTicketParser
 from sheet_customizer import SheetCustomizer
+from ttl_cache import TTLCache
 
 # Configure logging
 logging.basicConfig(
@@ -23,55 +32,195 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Status a ticket must move into to trigger QA test plan creation (casefolded)
+TRIGGER_STATUS = 'selected for development'
+
+# Payloads above this size are scanned for a status changelog item before being
+# parsed; Jira issue payloads carry the full field set and can run to megabytes
+PRESCAN_MIN_BYTES = 8192
+STATUS_CHANGE_PATTERN = re.compile(rb'"field"\s*:\s*"status"')
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for webhook parsing and responses."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+
+# Constant response bodies, serialized once at import
+HEALTH_BODY = orjson.dumps({'status': 'healthy', 'service': 'qa-test-plan-automation'})
+EVENT_NOT_RELEVANT_BODY = orjson.dumps({'message': 'Event type not relevant'})
+STATUS_NOT_CHANGED_BODY = orjson.dumps({'message': 'Status not changed to Selected For Development'})
+ISSUE_KEY_REQUIRED_BODY = orjson.dumps({'error': 'issue_key or issue_keys is required'})
+
+
+def _json_response(obj, status=200):
+    """
+    Build a JSON response by writing orjson bytes straight into the response body.
+    
+    Args:
+        obj: JSON-serializable object, or already serialized JSON bytes.
+        status (int): HTTP status code.
+        
+    Returns:
+        Response: Flask response object.
+    """
+    body = obj if isinstance(obj, bytes) else orjson.dumps(obj)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+# Service managers are created on first use so importing the app (and /health)
+# does not pay for client construction on a cold start
+@lru_cache(maxsize=1)
+def get_sheets_manager():
+    """Return the shared GoogleSheetsManager."""
+    return GoogleSheetsManager()
+
+
+@lru_cache(maxsize=1)
+def get_jira_client():
+    """Return the shared JiraClient."""
+    return JiraClient()
+
+
+@lru_cache(maxsize=1)
+def get_ticket_parser():
+    """Return the shared JiraTicketParser, backed by the shared JiraClient."""
+    return JiraTicketParser(get_jira_client())
 
-# Initialize service managers
-sheets_manager = GoogleSheetsManager()
-jira_client = JiraClient()
-ticket_parser = JiraTicketParser()
-sheet_customizer = SheetCustomizer()
 
+@lru_cache(maxsize=1)
+def get_sheet_customizer():
+    """Return the shared SheetCustomizer."""
+    return SheetCustomizer()
 
-def _qa_plan_already_exists(issue_key):
+
+@atexit.register
+def _close_clients():
+    """Close pooled HTTP connections on interpreter shutdown."""
+    if get_jira_client.cache_info().currsize:
+        get_jira_client().close()
+
+
+# Background executor so webhook requests return before the Jira/Google work runs
+qa_plan_executor = ThreadPoolExecutor(
+    max_workers=Config.QA_PLAN_WORKERS,
+    thread_name_prefix='qa-plan'
+)
+
+# Small fire-and-forget pool for error notifications, so failure paths do not wait
+# on an extra Jira round-trip before returning
+notification_executor = ThreadPoolExecutor(
+    max_workers=4,
+    thread_name_prefix='jira-notify'
+)
+
+# Caps sheet customizations in flight across webhook and bulk workers, so a large
+# bulk request overlaps Sheets round trips without bursting the per-minute write quota
+sheets_write_slots = threading.BoundedSemaphore(Config.SHEETS_MAX_CONCURRENT_WRITES)
+
+# Issues known to already have a QA test plan. A created plan never disappears,
+# so duplicate or retried webhook deliveries can skip the Jira lookup entirely.
+qa_plan_exists_cache = TTLCache(maxsize=1024, ttl=30 * 86400)
+
+# Idempotency keys: one in-flight creation per issue, and Jira delivery IDs seen in
+# the last day, so concurrent or redelivered webhooks collapse into a single run
+qa_plan_locks = TTLCache(maxsize=1024, ttl=600)
+webhook_delivery_ids = TTLCache(maxsize=4096, ttl=86400)
+
+# Plain text of Jira comments keyed by (comment id, updated timestamp); a saved
+# comment body only changes together with its 'updated' value
+comment_text_cache = TTLCache(maxsize=4096, ttl=86400)
+
+
+def _qa_plan_already_exists(issue_key, issue_data=None):
     """
     Check if a QA test plan comment already exists for this issue.
     
     Args:
         issue_key (str): The Jira issue key (e.g., "MTP-1234").
+        issue_data (dict, optional): Previously fetched issue data. Fetched from Jira if not provided.
         
     Returns:
         bool: True if QA test plan already exists, False otherwise.
     """
     try:
-        logger.info(f"Checking if QA test plan already exists for {issue_key}")
+        if qa_plan_exists_cache.get(issue_key):
+            logger.info("QA test plan for %s found in cache", issue_key)
+            return True
+        
+        logger.info("Checking if QA test plan already exists for %s", issue_key)
         
         # Get issue details to check existing comments
-        issue_data = jira_client.get_issue(issue_key)
+        if issue_data is None:
+            issue_data = get_jira_client().get_issue(issue_key, fields=QA_PLAN_FIELDS)
         comments = issue_data.get('fields', {}).get('comment', {}).get('comments', [])
         
-        # Check if any comment contains "QA Test Plan has been created"
-        for comment in comments:
-            comment_body = comment.get('body', {})
-            if isinstance(comment_body, dict):
-                # Extract text from comment body (Jira uses structured content)
-                comment_text = _extract_text_from_jira_body(comment_body)
-            else:
-                comment_text = str(comment_body)
-            
-            if "QA Test Plan has been created:" in comment_text:
-                logger.info(f"Found existing QA test plan comment for {issue_key}")
+        # Check if any comment contains the QA test plan marker. Jira returns comments
+        # oldest first and the marker is usually recent, so scan newest first.
+        for comment in reversed(comments):
+            if QA_PLAN_COMMENT_PREFIX in _get_comment_text(comment):
+                logger.info("Found existing QA test plan comment for %s", issue_key)
+                qa_plan_exists_cache.set(issue_key, True)
                 return True
         
-        logger.info(f"No existing QA test plan found for {issue_key}")
+        logger.info("No existing QA test plan found for %s", issue_key)
         return False
         
     except Exception as e:
-        logger.error(f"Error checking for existing QA test plan: {e}")
+        logger.error("Error checking for existing QA test plan: %s", e)
         # If we can't check, assume it doesn't exist to avoid blocking legitimate requests
         return False
 
 
+def _get_comment_text(comment):
+    """
+    Return the plain text of a Jira comment, cached by comment id and update time.
+    
+    Args:
+        comment (dict): Jira comment object.
+        
+    Returns:
+        str: Plain text content.
+    """
+    cache_key = (comment.get('id'), comment.get('updated'))
+    if cache_key[0] is not None:
+        comment_text = comment_text_cache.get(cache_key)
+        if comment_text is not None:
+            return comment_text
+    
+    comment_text = _extract_text_from_jira_body(comment.get('body', {}))
+    
+    if cache_key[0] is not None:
+        comment_text_cache.set(cache_key, comment_text)
+    return comment_text
+
+
+def _iter_text_nodes(node):
+    """
+    Yield the text of every text node in a Jira document tree.
+    
+    Args:
+        node (dict): Jira document node.
+        
+    Yields:
+        str: Text content of each text node, in document order.
+    """
+    if node.get('type') == 'text':
+        yield node.get('text', '')
+    for child in node.get('content', ()):
+        yield from _iter_text_nodes(child)
+
+
 def _extract_text_from_jira_body(body):
     """
     Extract plain text from Jira's structured comment body.
@@ -85,17 +234,7 @@ def _extract_text_from_jira_body(body):
     if not isinstance(body, dict):
         return str(body)
     
-    text_parts = []
-    
-    # Handle Jira's document structure
-    content = body.get('content', [])
-    for item in content:
-        if item.get('type') == 'paragraph':
-            for content_item in item.get('content', []):
-                if content_item.get('type') == 'text':
-                    text_parts.append(content_item.get('text', ''))
-    
-    return ' '.join(text_parts)
+    return ' '.join(_iter_text_nodes(body))
 
 
 def is_project_allowed(issue_key):
@@ -111,16 +250,12 @@ def is_project_allowed(issue_key):
     if not issue_key:
         return False
     
-    # Extract project key from issue key (e.g., "MTP" from "MTP-1234")
-    project_key = issue_key.split('-')[0] if '-' in issue_key else issue_key
-    
     # If ALLOWED_PROJECTS is empty or contains empty string, allow all projects
-    allowed_projects = [p.strip() for p in Config.ALLOWED_PROJECTS if p.strip()]
-    
-    if not allowed_projects:
+    if not Config.ALLOWED_PROJECTS_SET:
         return True
     
-    return project_key in allowed_projects
+    # Extract project key from issue key (e.g., "MTP" from "MTP-1234")
+    return issue_key.partition('-')[0] in Config.ALLOWED_PROJECTS_SET
 
 
 @app.route('/health', methods=['GET'])
@@ -131,89 +266,241 @@ def health_check():
     Returns:
         Response: JSON response indicating service health.
     """
-    return jsonify({
-        'status': 'healthy',
-        'service': 'qa-test-plan-automation'
-    }), 200
+    return _json_response(HEALTH_BODY, 200)
+
+
+def _release_idempotency_keys(issue_key, delivery_id=None):
+    """
+    Release the idempotency keys held for a failed run so Jira can retry it.
+    
+    Args:
+        issue_key (str): The Jira issue key (e.g., "MTP-1234").
+        delivery_id (str, optional): The X-Atlassian-Webhook-Identifier of the delivery.
+    """
+    qa_plan_locks.pop(issue_key)
+    if delivery_id:
+        webhook_delivery_ids.pop(delivery_id)
+
+
+def _log_notification_result(issue_key, description, future):
+    """
+    Log the outcome of a background Jira comment.
+    
+    Args:
+        issue_key (str): The Jira issue key (e.g., "MTP-1234").
+        description (str): What the comment is, for the log (e.g., "error notification").
+        future (Future): The completed add_comment future.
+    """
+    comment_error = future.exception()
+    if comment_error:
+        logger.error("Failed to post %s to Jira: %s", description, comment_error)
+    else:
+        logger.info("%s posted to Jira for %s", description.capitalize(), issue_key)
+
+
+def _post_comment_in_background(issue_key, comment_text, description):
+    """
+    Post a Jira comment on the notification executor without blocking the caller.
+    
+    Args:
+        issue_key (str): The Jira issue key (e.g., "MTP-1234").
+        comment_text (str): The comment text to add.
+        description (str): What the comment is, for the log (e.g., "warning").
+    """
+    future = notification_executor.submit(get_jira_client().add_comment, issue_key, comment_text)
+    future.add_done_callback(lambda f: _log_notification_result(issue_key, description, f))
+
+
+def _notify_failure(issue_key, error):
+    """
+    Post a failure comment to Jira without blocking the caller.
+    
+    Args:
+        issue_key (str): The Jira issue key (e.g., "MTP-1234").
+        error (Exception): The error to report.
+    """
+    error_message = f"❌ QA Test Plan automation failed: {str(error)}"
+    _post_comment_in_background(issue_key, error_message, "error notification")
+
+
+def _run_qa_test_plan_task(issue_key, delivery_id=None):
+    """
+    Run QA test plan creation on the background executor.
+    
+    Failures are already reported to Jira by create_qa_test_plan; this wrapper
+    only makes sure they reach the logs instead of disappearing with the future.
+    
+    Args:
+        issue_key (str): The Jira issue key (e.g., "MTP-1234").
+        delivery_id (str, optional): The X-Atlassian-Webhook-Identifier of the delivery.
+    """
+    try:
+        create_qa_test_plan(issue_key)
+    except Exception as e:
+        _release_idempotency_keys(issue_key, delivery_id)
+        logger.error("Background QA test plan creation failed for %s: %s", issue_key, e, exc_info=True)
 
 
 @app.route('/webhook', methods=['POST'])
-def jira_webhook():
+def jira_webhook(run_in_background=True):
     """
     Main webhook endpoint for Jira events.
     
     Triggered when a Jira ticket is moved to "Selected For Development" status.
-    Creates a QA test plan Google Sheet and posts a comment back to Jira.
+    Queues creation of a QA test plan Google Sheet and a comment back to Jira.
+    
+    Args:
+        run_in_background (bool): Queue the work and return 202 immediately. Serverless
+            handlers pass False because the runtime is frozen once a response is sent.
     
     Returns:
         Response: JSON response with operation status.
     """
     try:
-        # Parse webhook payload
-        payload = request.get_json()
-        
-        if not payload:
-            logger.warning("Received webhook with no payload")
-            return jsonify({'error': 'No payload received'}), 400
-        
-        logger.info(f"Received webhook event: {payload.get('webhookEvent', 'unknown')}")
+        # Cheap pre-filters from the webhook URL (e.g. /webhook?key=${issue.key}) let
+        # irrelevant deliveries return before the payload is read and parsed
+        query_event = request.args.get('event')
+        if query_event and query_event != 'jira:issue_updated':
+            logger.info("Ignoring non-update event from query string: %s", query_event)
+            return _json_response(EVENT_NOT_RELEVANT_BODY, 200)
+        
+        query_key = request.args.get('key')
+        if query_key and not is_project_allowed(query_key):
+            project_key = query_key.partition('-')[0]
+            logger.info("Ignoring issue %s from project %s before parsing payload (not in allowed projects: %s)", query_key, project_key, Config.ALLOWED_PROJECTS)
+            return _json_response({
+                'message': f'Project {project_key} is not in the allowed projects list',
+                'allowed_projects': Config.ALLOWED_PROJECTS
+            }, 200)
         
-        # Check if this is a status change event
-        webhook_event = payload.get('webhookEvent', '')
+        # Large payloads without a status changelog item cannot trigger creation,
+        # so skip decoding the whole issue document for them
+        if (request.content_length or 0) > PRESCAN_MIN_BYTES:
+            raw_body = request.get_data(cache=True)
+            if not STATUS_CHANGE_PATTERN.search(raw_body):
+                logger.info("Ignoring webhook without a status change before parsing payload")
+                return _json_response(STATUS_NOT_CHANGED_BODY, 200)
         
-        if webhook_event != 'jira:issue_updated':
-            logger.info(f"Ignoring non-update event: {webhook_event}")
-            return jsonify({'message': 'Event type not relevant'}), 200
+        # Parse webhook payload
+        payload = request.get_json()
+        delivery_id = request.headers.get('X-Atlassian-Webhook-Identifier')
         
-        # Extract issue information
-        issue = payload.get('issue', {})
-        issue_key = issue.get('key')
+        result, status_code = process_webhook_payload(
+            payload,
+            delivery_id=delivery_id,
+            run_in_background=run_in_background
+        )
+        return _json_response(result, status_code)
         
-        if not issue_key:
-            logger.error("No issue key found in webhook payload")
-            return jsonify({'error': 'No issue key found'}), 400
+    except Exception as e:
+        logger.error("Error processing webhook: %s", e, exc_info=True)
+        return _json_response({'error': str(e)}, 500)
+
+
+def process_webhook_payload(payload, delivery_id=None, run_in_background=True):
+    """
+    Validate a parsed Jira webhook payload and start QA test plan creation.
+    
+    Shared by the Flask route and the serverless handler so neither needs a
+    request context to run the webhook logic.
+    
+    Args:
+        payload (dict): Parsed Jira webhook payload.
+        delivery_id (str, optional): The X-Atlassian-Webhook-Identifier of the delivery.
+        run_in_background (bool): Queue the work and return 202 immediately.
+    
+    Returns:
+        tuple: (response body dict, HTTP status code).
         
-        # Check if the project is allowed
-        if not is_project_allowed(issue_key):
-            project_key = issue_key.split('-')[0] if '-' in issue_key else issue_key
-            logger.info(f"Ignoring issue {issue_key} from project {project_key} (not in allowed projects: {Config.ALLOWED_PROJECTS})")
-            return jsonify({
-                'message': f'Project {project_key} is not in the allowed projects list',
-                'allowed_projects': Config.ALLOWED_PROJECTS
-            }), 200
-        
-        # Check if status changed to "Selected For Development"
-        changelog = payload.get('changelog', {})
-        items = changelog.get('items', [])
-        
-        status_changed_to_sfd = False
-        for item in items:
-            if item.get('field') == 'status':
-                from_status = item.get('fromString', '').strip()
-                to_status = item.get('toString', '').strip()
-                
-                # Check if this is actually a status change TO "Selected For Development"
-                # and NOT from the same (to prevent loops)
-                if (to_status.lower() == 'selected for development' and 
-                    from_status.lower() != 'selected for development'):
-                    status_changed_to_sfd = True
-                    logger.info(f"Status change detected: '{from_status}' → '{to_status}'")
-                    break
-        
-        if not status_changed_to_sfd:
-            logger.info(f"Issue {issue_key} - No valid status change to 'Selected For Development' detected, ignoring")
-            return jsonify({'message': 'Status not changed to Selected For Development'}), 200
-        
-        logger.info(f"Processing issue {issue_key} - Status changed to 'Selected For Development'")
-        
-        # Create QA test plan
+    Raises:
+        Exception: If synchronous QA test plan creation fails.
+    """
+    if not payload:
+        logger.warning("Received webhook with no payload")
+        return {'error': 'No payload received'}, 400
+    
+    logger.info("Received webhook event: %s", payload.get('webhookEvent', 'unknown'))
+    
+    # Check if this is a status change event
+    webhook_event = payload.get('webhookEvent', '')
+    
+    if webhook_event != 'jira:issue_updated':
+        logger.info("Ignoring non-update event: %s", webhook_event)
+        return {'message': 'Event type not relevant'}, 200
+    
+    # Extract issue information
+    issue = payload.get('issue', {})
+    issue_key = issue.get('key')
+    
+    if not issue_key:
+        logger.error("No issue key found in webhook payload")
+        return {'error': 'No issue key found'}, 400
+    
+    # Check if the project is allowed
+    if not is_project_allowed(issue_key):
+        project_key = issue_key.partition('-')[0]
+        logger.info("Ignoring issue %s from project %s (not in allowed projects: %s)", issue_key, project_key, Config.ALLOWED_PROJECTS)
+        return {
+            'message': f'Project {project_key} is not in the allowed projects list',
+            'allowed_projects': Config.ALLOWED_PROJECTS
+        }, 200
+    
+    # Check if status changed to "Selected For Development"
+    changelog = payload.get('changelog', {})
+    items = changelog.get('items', [])
+    
+    # A status change TO "Selected For Development" and NOT from the same (to prevent loops)
+    status_items = (item for item in items if item.get('field') == 'status')
+    status_changed_to_sfd = any(
+        (item.get('toString') or '').strip().casefold() == TRIGGER_STATUS and
+        (item.get('fromString') or '').strip().casefold() != TRIGGER_STATUS
+        for item in status_items
+    )
+    
+    if not status_changed_to_sfd:
+        logger.info("Issue %s - No valid status change to 'Selected For Development' detected, ignoring", issue_key)
+        return {'message': 'Status not changed to Selected For Development'}, 200
+    
+    logger.info("Processing issue %s - Status changed to 'Selected For Development'", issue_key)
+    
+    # Drop redelivered webhooks and concurrent runs for the same issue
+    if delivery_id and not webhook_delivery_ids.add(delivery_id, True):
+        logger.info("Ignoring duplicate webhook delivery %s for %s", delivery_id, issue_key)
+        return {
+            'issue_key': issue_key,
+            'status': 'duplicate',
+            'message': 'Webhook delivery already processed'
+        }, 200
+    
+    if not qa_plan_locks.add(issue_key, True):
+        # Nothing ran for this delivery, so let Jira's retry of it through
+        if delivery_id:
+            webhook_delivery_ids.pop(delivery_id)
+        logger.info("QA test plan creation already in progress or done for %s, ignoring", issue_key)
+        return {
+            'issue_key': issue_key,
+            'status': 'duplicate',
+            'message': 'QA test plan creation already in progress'
+        }, 200
+    
+    if run_in_background:
+        # Queue QA test plan creation so Jira gets a response immediately
+        qa_plan_executor.submit(_run_qa_test_plan_task, issue_key, delivery_id)
+        logger.info("Queued QA test plan creation for %s", issue_key)
+        return {
+            'issue_key': issue_key,
+            'status': 'accepted',
+            'message': 'QA test plan creation queued'
+        }, 202
+    
+    # Create QA test plan
+    try:
         result = create_qa_test_plan(issue_key)
-        
-        return jsonify(result), 200
-        
-    except Exception as e:
-        logger.error(f"Error processing webhook: {e}", exc_info=True)
-        return jsonify({'error': str(e)}), 500
+    except Exception:
+        _release_idempotency_keys(issue_key, delivery_id)
+        raise
+    
+    return result, 200
 
 
 def create_qa_test_plan(issue_key):
@@ -221,11 +508,13 @@ def create_qa_test_plan(issue_key):
     Create a QA test plan for a Jira issue with Goals field customization.
     
     This function orchestrates the workflow:
-    1. Create a copy of the template sheet
+    1. Fetch the Jira issue once, check it for an existing plan, then create a copy
+       of the template sheet
     2. Rename it with the Jira issue key
     3. Move it to the destination folder
-    4. Parse Goals field and platform from Jira
-    5. Insert goals into the appropriate platform tab at row 28
+    4. Parse Goals field and platform from the fetched issue
+    5. Insert goals and custom attributes into the platform tab and prune the other
+       platform tabs in one batchUpdate
     6. Post a comment to Jira with the sheet URL
     
     Args:
@@ -238,102 +527,87 @@ def create_qa_test_plan(issue_key):
         Exception: If any step fails.
     """
     try:
-        logger.info(f"Starting QA test plan creation for {issue_key}")
+        logger.info("Starting QA test plan creation for %s", issue_key)
+        
+        # Fetch the issue once; it drives both the duplicate check and the parsing below
+        issue_data = None
+        if not qa_plan_exists_cache.get(issue_key):
+            try:
+                issue_data = get_jira_client().get_issue(issue_key, fields=QA_PLAN_FIELDS)
+            except Exception as e:
+                # The duplicate check and the parser fetch the issue themselves on demand
+                logger.warning("Failed to fetch issue %s, each step will retry: %s", issue_key, e)
         
         # Check if QA test plan already exists for this issue
-        if _qa_plan_already_exists(issue_key):
-            logger.info(f"QA test plan already exists for {issue_key}, skipping creation")
+        if _qa_plan_already_exists(issue_key, issue_data=issue_data):
+            logger.info("QA test plan already exists for %s, skipping creation", issue_key)
             return {
                 'issue_key': issue_key,
                 'status': 'skipped',
                 'message': 'QA test plan already exists for this issue'
             }
         
-        # Create the Google Sheet
-        sheet_info = sheets_manager.create_qa_test_plan(issue_key)
+        # Create the QA test plan sheet only after the duplicate check, so redeliveries
+        # never copy (and then have to remove) a Drive file
+        sheet_info = get_sheets_manager().create_qa_test_plan(issue_key)
+        
         sheet_id = sheet_info['sheet_id']
         sheet_url = sheet_info['sheet_url']
         
-        logger.info(f"QA test plan created: {sheet_url}")
+        # Remember the plan exists so redeliveries skip creation without asking Jira
+        qa_plan_exists_cache.set(issue_key, True)
         
-        # Parse platform and goals from Jira
-        platform = ticket_parser.extract_platform_from_labels(issue_key)
-        goals = ticket_parser.parse_goals_field(issue_key)
+        logger.info("QA test plan created: %s", sheet_url)
         
-        logger.info(f"Platform detected: {platform}")
-        logger.info(f"Goals found: {len(goals)}")
+        # Parse platform and goals from the issue fetched above
+        platform = get_ticket_parser().extract_platform_from_labels(issue_key, issue_data=issue_data)
+        goals = get_ticket_parser().parse_goals_field(issue_key, issue_data=issue_data)
         
-        # Customize the sheet with goals if any exist
-        goals_rows_inserted = 0  # Track how many rows Goals inserted
-        if goals:
-            try:
-                logger.info(f"Starting sheet customization with {len(goals)} goals for platform {platform}")
-                goals_rows_inserted = sheet_customizer.customize_sheet_with_goals(sheet_id, platform, goals)
-                logger.info(f"Successfully customized sheet with {len(goals)} goals in {platform}, inserted {goals_rows_inserted} additional rows")
-            except Exception as e:
-                logger.error(f"Failed to customize sheet with goals: {e}", exc_info=True)
-                # Continue anyway - sheet was created successfully
-        else:
-            # Post warning to Jira if no goals found
-            try:
-                warning_message = "Warning: No Goals field found in ticket. Sheet created without goals."
-                jira_client.add_comment(issue_key, warning_message)
-                logger.info(f"Warning posted to Jira for {issue_key}")
-            except Exception as comment_error:
-                logger.error(f"Failed to post warning to Jira: {comment_error}")
+        logger.info("Platform detected: %s", platform)
+        logger.info("Goals found: %s", len(goals))
+        
+        if not goals:
+            # Post warning to Jira if no goals found; it goes out while the sheet is customized
+            warning_message = "Warning: No Goals field found in ticket. Sheet created without goals."
+            _post_comment_in_background(issue_key, warning_message, "warning")
 
         # Custom attributes processing - ONLY for Optimizely tickets
         # This is a separate check that runs independently of Goals processing
+        custom_attributes = []
         if platform == "[Optimizely] QA Pass 1":
             try:
-                logger.info(f"Checking for Custom attributes field for Optimizely ticket: {issue_key}")
-                custom_attributes = ticket_parser.parse_custom_attributes_field(issue_key)
-                
+                logger.info("Checking for Custom attributes field for Optimizely ticket: %s", issue_key)
+                custom_attributes = get_ticket_parser().parse_custom_attributes_field(issue_key, issue_data=issue_data)
                 if custom_attributes:
-                    logger.info(f"Found {len(custom_attributes)} custom attributes for Optimizely ticket")
-                    try:
-                        # Adjust start_row based on how many rows Goals inserted
-                        # When Goals inserts rows, everything from that insertion point down shifts
-                        # Goals starts at row 28, inserts rows after the 3 placeholders (at row 31)
-                        # So original row 34 shifts down by goals_rows_inserted
-                        adjusted_start_row = 34 + goals_rows_inserted
-                        logger.info(f"Custom attributes start row adjusted from 34 to {adjusted_start_row} (Goals inserted {goals_rows_inserted} rows)")
-                        
-                        logger.info(f"Starting sheet customization with {len(custom_attributes)} custom attributes for platform {platform}")
-                        sheet_customizer.customize_sheet_with_custom_attributes(sheet_id, platform, custom_attributes, start_row=adjusted_start_row)
-                        logger.info(f"Successfully customized sheet with {len(custom_attributes)} custom attributes in {platform} starting at row {adjusted_start_row}")
-                    except Exception as e:
-                        logger.error(f"Failed to customize sheet with custom attributes: {e}", exc_info=True)
-                        # Continue anyway - sheet was created successfully, custom attributes are optional
+                    logger.info("Found %s custom attributes for Optimizely ticket", len(custom_attributes))
                 else:
-                    logger.info(f"No Custom attributes field found or empty for Optimizely ticket: {issue_key}")
+                    logger.info("No Custom attributes field found or empty for Optimizely ticket: %s", issue_key)
             except Exception as e:
-                logger.error(f"Error processing Custom attributes for Optimizely ticket: {e}", exc_info=True)
+                logger.error("Error processing Custom attributes for Optimizely ticket: %s", e, exc_info=True)
                 # Continue anyway - custom attributes processing should not break the main flow
 
-        # Prune other platform tabs while keeping the selected platform and Complexity & Risk
+        # Insert goals (at the platform's goal row) and custom attributes (at row 34, shifted
+        # down by the goal rows inserted), then prune other platform tabs while keeping the
+        # selected platform and Complexity & Risk - all in one batchUpdate
         try:
-            logger.info(f"Pruning platform tabs; keeping '{platform}' and 'Complexity & Risk'")
-            sheet_customizer.prune_platform_tabs(sheet_id, platform)
-        except Exception as prune_error:
-            # Log but do not fail the operation
-            logger.error(f"Failed to prune platform tabs: {prune_error}")
+            logger.info("Customizing sheet with %s goals and %s custom attributes for platform %s", len(goals), len(custom_attributes), platform)
+            with sheets_write_slots:
+                goals_rows_inserted = get_sheet_customizer().customize_qa_test_plan(sheet_id, platform, goals, custom_attributes)
+            logger.info("Successfully customized sheet for %s, inserted %s additional goal rows", platform, goals_rows_inserted)
+        except Exception as e:
+            logger.error("Failed to customize sheet: %s", e, exc_info=True)
+            # Continue anyway - sheet was created successfully
         
         # Post comment to Jira
         try:
-            jira_client.post_qa_plan_comment(issue_key, sheet_url)
-            logger.info(f"Comment posted to Jira issue {issue_key}")
+            get_jira_client().post_qa_plan_comment(issue_key, sheet_url)
+            logger.info("Comment posted to Jira issue %s", issue_key)
         except Exception as e:
             # Log error but don't fail the entire operation
             # The sheet was created successfully
-            logger.error(f"Failed to post comment to Jira: {e}")
-            # Try to post error notification to Jira
-            try:
-                error_message = f"❌ QA Test Plan automation failed: {str(e)}"
-                jira_client.add_comment(issue_key, error_message)
-                logger.info(f"Error notification posted to Jira for {issue_key}")
-            except Exception as comment_error:
-                logger.error(f"Failed to post error notification to Jira: {comment_error}")
+            logger.error("Failed to post comment to Jira: %s", e)
+            # Post error notification to Jira in the background
+            _notify_failure(issue_key, e)
             
             return {
                 'issue_key': issue_key,
@@ -353,25 +627,58 @@ def create_qa_test_plan(issue_key):
         }
         
     except Exception as e:
-        logger.error(f"Failed to create QA test plan: {e}")
+        logger.error("Failed to create QA test plan: %s", e)
         
-        # Try to post error notification to Jira
-        try:
-            error_message = f"❌ QA Test Plan automation failed: {str(e)}"
-            jira_client.add_comment(issue_key, error_message)
-            logger.info(f"Error notification posted to Jira for {issue_key}")
-        except Exception as comment_error:
-            logger.error(f"Failed to post error notification to Jira: {comment_error}")
+        # Post error notification to Jira in the background
+        _notify_failure(issue_key, e)
         
         raise
 
 
+def create_qa_test_plans(issue_keys):
+    """
+    Create QA test plans for several Jira issues concurrently.
+    
+    Each issue runs the full create_qa_test_plan workflow on its own thread, so
+    the Jira and Google round trips of different issues overlap.
+    
+    Args:
+        issue_keys (list): Jira issue keys (e.g., ["MTP-1234", "MTP-1235"]).
+        
+    Returns:
+        list: One result dict per unique issue key, in request order. Failed issues
+            get a result with status 'error' instead of raising.
+    """
+    issue_keys = list(dict.fromkeys(issue_keys))
+    if not issue_keys:
+        return []
+    
+    results = []
+    with ThreadPoolExecutor(
+        max_workers=min(Config.QA_PLAN_BULK_WORKERS, len(issue_keys)),
+        thread_name_prefix='qa-plan-bulk'
+    ) as executor:
+        futures = [(issue_key, executor.submit(create_qa_test_plan, issue_key)) for issue_key in issue_keys]
+        for issue_key, future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({
+                    'issue_key': issue_key,
+                    'status': 'error',
+                    'error': str(e)
+                })
+    
+    return results
+
+
 @app.route('/test-create', methods=['POST'])
 def test_create():
     """
     Test endpoint to manually trigger QA test plan creation.
     
-    Expects JSON payload with 'issue_key' field.
+    Expects JSON payload with an 'issue_key' field, or an 'issue_keys' list to
+    create several plans concurrently.
     Useful for testing without setting up Jira webhooks.
     
     Returns:
@@ -380,34 +687,71 @@ def test_create():
     try:
         data = request.get_json()
         
-        if not data or 'issue_key' not in data:
-            return jsonify({'error': 'issue_key is required'}), 400
+        if not data or ('issue_key' not in data and not data.get('issue_keys')):
+            return _json_response(ISSUE_KEY_REQUIRED_BODY, 400)
+        
+        if 'issue_key' not in data:
+            issue_keys = data['issue_keys']
+            logger.info("Test endpoint called for %s issues", len(issue_keys))
+            
+            rejected = [key for key in issue_keys if not is_project_allowed(key)]
+            if rejected:
+                logger.warning("Rejecting test request for issues %s (not in allowed projects: %s)", rejected, Config.ALLOWED_PROJECTS)
+                return _json_response({
+                    'error': f'Issues not in the allowed projects list: {", ".join(rejected)}',
+                    'allowed_projects': Config.ALLOWED_PROJECTS
+                }, 403)
+            
+            return _json_response({'results': create_qa_test_plans(issue_keys)}, 200)
         
         issue_key = data['issue_key']
-        logger.info(f"Test endpoint called for issue: {issue_key}")
+        logger.info("Test endpoint called for issue: %s", issue_key)
         
         # Check if the project is allowed
         if not is_project_allowed(issue_key):
-            project_key = issue_key.split('-')[0] if '-' in issue_key else issue_key
-            logger.warning(f"Rejecting test request for issue {issue_key} from project {project_key} (not in allowed projects: {Config.ALLOWED_PROJECTS})")
-            return jsonify({
+            project_key = issue_key.partition('-')[0]
+            logger.warning("Rejecting test request for issue %s from project %s (not in allowed projects: %s)", issue_key, project_key, Config.ALLOWED_PROJECTS)
+            return _json_response({
                 'error': f'Project {project_key} is not in the allowed projects list',
                 'allowed_projects': Config.ALLOWED_PROJECTS
-            }), 403
+            }, 403)
         
         result = create_qa_test_plan(issue_key)
         
-        return jsonify(result), 200
+        return _json_response(result, 200)
         
     except Exception as e:
-        logger.error(f"Error in test endpoint: {e}", exc_info=True)
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error in test endpoint: %s", e, exc_info=True)
+        return _json_response({'error': str(e)}, 500)
+
+
+# Set once initialize_app has completed; serverless handlers call it on every
+# invocation, but warm containers only need it on cold start
+_app_initialized = False
+_app_init_lock = threading.Lock()
 
 
 def initialize_app():
     """
     Initialize the application by validating configuration and services.
+    
+    Runs once per process; later calls return immediately, so warm invocations
+    don't re-authenticate or re-warm the Jira connection.
     """
+    global _app_initialized
+    
+    if _app_initialized:
+        return
+    
+    with _app_init_lock:
+        if _app_initialized:
+            return
+        _initialize_app()
+        _app_initialized = True
+
+
+def _initialize_app():
+    """Validate configuration, authenticate with Google and warm the Jira connection."""
     try:
         logger.info("Initializing application...")
         
@@ -416,13 +760,19 @@ def initialize_app():
         logger.info("Configuration validated successfully")
         
         # Initialize Google services (authenticate)
-        sheets_manager.initialize_services()
+        get_sheets_manager().initialize_services()
+        # The customizer shares the Sheets service built above; bind it now rather
+        # than on the first request
+        get_sheet_customizer().initialize_service()
         logger.info("Google services initialized successfully")
         
+        # Open the Jira connection pool before the first webhook needs it
+        get_jira_client().warm_connection()
+        
         logger.info("Application initialization complete")
         
     except Exception as e:
-        logger.error(f"Failed to initialize application: {e}")
+        logger.error("Failed to initialize application: %s", e)
         raise
 
 
@@ -439,41 +789,42 @@ def handler(event, context):
         dict: Response with statusCode and body.
     """
     try:
-        # Initialize app on first invocation
+        # Initialize app on first invocation (a no-op on warm invocations)
         initialize_app()
         
         # Parse event based on platform
         # This is a simplified example - actual implementation depends on platform
         if 'body' in event:
-            import json
-            payload = json.loads(event['body'])
+            # Run the webhook logic directly; no Flask request context is needed
+            payload = orjson.loads(event['body']) if event['body'] else None
+            headers = event.get('headers') or {}
+            delivery_id = (headers.get('X-Atlassian-Webhook-Identifier')
+                           or headers.get('x-atlassian-webhook-identifier'))
             
-            # Simulate Flask request
-            with app.test_request_context(
-                path='/webhook',
-                method='POST',
-                json=payload
-            ):
-                response = jira_webhook()
-                
-                return {
-                    'statusCode': response[1],
-                    'body': response[0].get_data(as_text=True),
-                    'headers': {
-                        'Content-Type': 'application/json'
-                    }
+            result, status_code = process_webhook_payload(
+                payload,
+                delivery_id=delivery_id,
+                run_in_background=False
+            )
+            
+            return {
+                'statusCode': status_code,
+                'body': orjson.dumps(result).decode('utf-8'),
+                'headers': {
+                    'Content-Type': 'application/json'
                 }
+            }
         
         return {
             'statusCode': 400,
-            'body': json.dumps({'error': 'Invalid event format'})
+            'body': orjson.dumps({'error': 'Invalid event format'}).decode('utf-8')
         }
         
     except Exception as e:
-        logger.error(f"Handler error: {e}")
+        logger.error("Handler error: %s", e)
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+            'body': orjson.dumps({'error': str(e)}).decode('utf-8')
         }
 
 
@@ -481,9 +832,10 @@ if __name__ == '__main__':
     # Initialize the application
     initialize_app()
     
-    # Run the Flask development server
+    # Run the Flask development server (local use only; production runs under
+    # gunicorn, see Procfile)
     port = 5000
-    logger.info(f"Starting Flask server on port {port}")
+    logger.info("Starting Flask server on port %s", port)
     app.run(
         host='0.0.0.0',
         port=port,
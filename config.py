@@ -36,9 +36,19 @@ class Config:
     # Application Settings
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
+    # Background Processing
+    # Number of worker threads creating QA test plans off the webhook request path
+    QA_PLAN_WORKERS = int(os.getenv('QA_PLAN_WORKERS', '1'))
+    # Number of issues processed concurrently by a bulk /test-create request
+    QA_PLAN_BULK_WORKERS = int(os.getenv('QA_PLAN_BULK_WORKERS', '8'))
+    # Number of sheet customizations (Sheets batchUpdates) allowed in flight at once
+    SHEETS_MAX_CONCURRENT_WRITES = int(os.getenv('SHEETS_MAX_CONCURRENT_WRITES', '4'))
+    
     # Project Restrictions
     # Only process issues from these Jira projects (leave empty for all projects)
     ALLOWED_PROJECTS = os.getenv('ALLOWED_PROJECTS', 'MTP').split(',')
+    # Stripped, non-empty keys for O(1) membership checks on every webhook
+    ALLOWED_PROJECTS_SET = frozenset(p.strip() for p in ALLOWED_PROJECTS if p.strip())
     
     @staticmethod
     def validate():
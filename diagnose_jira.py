@@ -2,12 +2,19 @@
 """
 Diagnostic tool to identify Jira API issues.
 """
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 import os
-from dotenv import load_dotenv
+import sys
 
-load_dotenv()
+# Platform-provided environments (Railway, Kubernetes) already set the variables;
+# only fall back to parsing .env for local runs
+if 'JIRA_API_TOKEN' not in os.environ:
+    from dotenv import load_dotenv
+    load_dotenv()
 
 def diagnose_jira_api():
     """Diagnose Jira API connection issues."""
@@ -32,17 +39,23 @@ def diagnose_jira_api():
         print("3. Get token from: https://id.atlassian.com/manage/api-tokens")
         return False
     
+    # One session so the auth probe and the issue probes share auth, headers and a
+    # keep-alive connection
+    base_url = jira_url.rstrip('/')
+    session = requests.Session()
+    session.auth = HTTPBasicAuth(username, api_token)
+    session.headers.update({'Accept': 'application/json'})
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry))
+    
     # Test basic authentication
     print(f"\n🧪 Testing authentication...")
     try:
-        url = f"{jira_url.rstrip('/')}/rest/api/3/myself"
-        auth = HTTPBasicAuth(username, api_token)
-        headers = {'Accept': 'application/json'}
-        
-        response = requests.get(url, auth=auth, headers=headers, timeout=10)
+        url = f"{base_url}/rest/api/3/myself"
+        response = session.get(url, timeout=10)
         
         if response.status_code == 200:
-            user_data = response.json()
+            user_data = orjson.loads(response.content)
             print(f"✅ Authentication successful!")
             print(f"✅ User: {user_data.get('displayName', 'Unknown')}")
             print(f"✅ Email: {user_data.get('emailAddress', 'Unknown')}")
@@ -71,22 +84,32 @@ def diagnose_jira_api():
     print(f"\n🧪 Testing issue access...")
     test_issues = ['MTP-71', 'MTP-1', 'MTP-2']
     
-    for issue_key in test_issues:
-        try:
-            url = f"{jira_url.rstrip('/')}/rest/api/3/issue/{issue_key}"
-            response = requests.get(url, auth=auth, headers=headers, timeout=10)
+    try:
+        # Probe all keys in one round trip; missing keys come back in issueErrors
+        url = f"{base_url}/rest/api/3/issue/bulkfetch"
+        payload = orjson.dumps({'issueIdsOrKeys': test_issues, 'fields': ['summary']})
+        response = session.post(url, data=payload, headers={'Content-Type': 'application/json'}, timeout=10)
+        
+        if response.status_code == 200:
+            found = {}
+            for issue in orjson.loads(response.content).get('issues', []):
+                fields = issue.get('fields')
+                found[issue.get('key')] = fields.get('summary', 'No summary') if fields else 'No summary'
             
-            if response.status_code == 200:
-                issue_data = response.json()
-                print(f"✅ {issue_key}: Found - {issue_data.get('fields', {}).get('summary', 'No summary')}")
+            # Report every key in one write
+            lines = [
+                f"✅ {issue_key}: Found - {found[issue_key]}" if issue_key in found
+                else f"⚠️  {issue_key}: Not found (404)"
+                for issue_key in test_issues
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
+            if found:
                 return True
-            elif response.status_code == 404:
-                print(f"⚠️  {issue_key}: Not found (404)")
-            else:
-                print(f"❌ {issue_key}: Error {response.status_code}")
-                
-        except Exception as e:
-            print(f"❌ {issue_key}: Error - {e}")
+        else:
+            print(f"❌ Issue lookup: Error {response.status_code}")
+            
+    except Exception as e:
+        print(f"❌ Issue lookup: Error - {e}")
     
     print(f"\n❌ No accessible MTP issues found.")
     print(f"This could mean:")
@@ -4,17 +4,90 @@ Handles OAuth 2.0 authentication for Google Drive and Sheets APIs.
 """
 import os
 import logging
+import threading
+from datetime import datetime, timedelta, timezone
+import google_auth_httplib2
+import orjson
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
 
 from config import Config
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Credentials and API service objects shared by every GoogleAuthManager, so the
+# token is loaded and each service built once per process
+_credentials = None
+_services = {}
+_lock = threading.RLock()
+
+# httplib2 connections are not thread-safe; each thread gets its own authorized client
+_thread_local = threading.local()
+
+# Access tokens are refreshed this long before they expire, so no API call waits
+# on a refresh after a 401
+REFRESH_MARGIN = timedelta(minutes=5)
+
+
+def _needs_refresh(credentials):
+    """
+    Check whether credentials expire within REFRESH_MARGIN.
+    
+    Args:
+        credentials (Credentials): Google OAuth credentials.
+        
+    Returns:
+        bool: True if the access token should be refreshed now.
+    """
+    if not credentials.refresh_token or credentials.expiry is None:
+        return False
+    # google-auth stores expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return credentials.expiry - now < REFRESH_MARGIN
+
+
+def _refresh_if_expiring():
+    """Refresh the shared credentials ahead of expiry; failures are left to the 401 retry."""
+    if _credentials is None or not _needs_refresh(_credentials):
+        return
+    with _lock:
+        if not _needs_refresh(_credentials):
+            return
+        try:
+            logger.info("Refreshing Google credentials ahead of expiry")
+            _credentials.refresh(Request())
+        except Exception as e:
+            logger.warning("Proactive Google credential refresh failed: %s", e)
+
+
+def _get_thread_http():
+    """
+    Return the calling thread's authorized HTTP client, creating it on first use.
+    
+    Returns:
+        AuthorizedHttp: HTTP client that signs requests with the shared credentials.
+    """
+    http = getattr(_thread_local, 'http', None)
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(_credentials, http=build_http())
+        _thread_local.http = http
+    return http
+
+
+def _build_request(http, *args, **kwargs):
+    """
+    Build an API request bound to the calling thread's HTTP client.
+    
+    AuthorizedHttp still refreshes and retries once if Google answers 401.
+    """
+    _refresh_if_expiring()
+    return HttpRequest(_get_thread_http(), *args, **kwargs)
+
 
 class GoogleAuthManager:
     """Manages Google API authentication and service creation."""
@@ -30,6 +103,26 @@ class GoogleAuthManager:
         """
         Authenticate with Google APIs using OAuth 2.0.
         
+        Credentials are loaded once per process and shared by all managers.
+        
+        Returns:
+            Credentials: Authenticated credentials object.
+            
+        Raises:
+            FileNotFoundError: If credentials.json file is not found.
+            Exception: If authentication fails.
+        """
+        global _credentials
+        with _lock:
+            if _credentials is None:
+                _credentials = self._load_credentials()
+            self.credentials = _credentials
+        return self.credentials
+    
+    def _load_credentials(self):
+        """
+        Load credentials from the environment or token file, running the OAuth flow if needed.
+        
         Returns:
             Credentials: Authenticated credentials object.
             
@@ -40,9 +133,8 @@ class GoogleAuthManager:
         try:
             # Check if credentials are in environment variable (for Railway/serverless)
             if os.getenv('GOOGLE_TOKEN_JSON'):
-                import json
                 logger.info("Loading credentials from environment variable")
-                token_data = json.loads(os.getenv('GOOGLE_TOKEN_JSON'))
+                token_data = orjson.loads(os.getenv('GOOGLE_TOKEN_JSON'))
                 self.credentials = Credentials.from_authorized_user_info(token_data, self.scopes)
                 if self.credentials and self.credentials.valid:
                     logger.info("Successfully loaded valid credentials from environment")
@@ -50,7 +142,7 @@ class GoogleAuthManager:
             
             # Check if we have existing valid credentials in file
             if os.path.exists(self.token_file):
-                logger.info(f"Loading credentials from {self.token_file}")
+                logger.info("Loading credentials from %s", self.token_file)
                 self.credentials = Credentials.from_authorized_user_file(
                     self.token_file, self.scopes
                 )
@@ -74,7 +166,7 @@ class GoogleAuthManager:
                     self.credentials = flow.run_local_server(port=0)
                 
                 # Save credentials for future use
-                logger.info(f"Saving credentials to {self.token_file}")
+                logger.info("Saving credentials to %s", self.token_file)
                 with open(self.token_file, 'w') as token:
                     token.write(self.credentials.to_json())
             
@@ -82,15 +174,15 @@ class GoogleAuthManager:
             return self.credentials
             
         except FileNotFoundError as e:
-            logger.error(f"Credentials file not found: {e}")
+            logger.error("Credentials file not found: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Authentication failed: {e}")
+            logger.error("Authentication failed: %s", e)
             raise
     
     def get_drive_service(self):
         """
-        Create and return a Google Drive service object.
+        Return the shared Google Drive service object.
         
         Returns:
             Resource: Google Drive API service object.
@@ -98,24 +190,11 @@ class GoogleAuthManager:
         Raises:
             Exception: If service creation fails.
         """
-        try:
-            if not self.credentials:
-                self.authenticate()
-            
-            logger.info("Creating Google Drive service")
-            service = build('drive', 'v3', credentials=self.credentials)
-            return service
-            
-        except HttpError as e:
-            logger.error(f"Failed to create Drive service: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error creating Drive service: {e}")
-            raise
+        return self._get_service('drive', 'v3', 'Drive')
     
     def get_sheets_service(self):
         """
-        Create and return a Google Sheets service object.
+        Return the shared Google Sheets service object.
         
         Returns:
             Resource: Google Sheets API service object.
@@ -123,18 +202,47 @@ class GoogleAuthManager:
         Raises:
             Exception: If service creation fails.
         """
-        try:
-            if not self.credentials:
-                self.authenticate()
+        return self._get_service('sheets', 'v4', 'Sheets')
+    
+    def _get_service(self, api_name, api_version, display_name):
+        """
+        Build a Google API service once per process and return the cached instance.
+        
+        Args:
+            api_name (str): API name (e.g., "drive").
+            api_version (str): API version (e.g., "v3").
+            display_name (str): Name used in log messages.
             
-            logger.info("Creating Google Sheets service")
-            service = build('sheets', 'v4', credentials=self.credentials)
+        Returns:
+            Resource: Google API service object.
+            
+        Raises:
+            Exception: If service creation fails.
+        """
+        try:
+            with _lock:
+                service = _services.get((api_name, api_version))
+                if service is None:
+                    if not self.credentials:
+                        self.authenticate()
+                    
+                    logger.info("Creating Google %s service", display_name)
+                    # Build from the discovery documents bundled with the client
+                    # library; never fetch or cache them over the network
+                    service = build(
+                        api_name,
+                        api_version,
+                        http=_get_thread_http(),
+                        requestBuilder=_build_request,
+                        static_discovery=True,
+                        cache_discovery=False
+                    )
+                    _services[(api_name, api_version)] = service
             return service
             
         except HttpError as e:
-            logger.error(f"Failed to create Sheets service: {e}")
+            logger.error("Failed to create %s service: %s", display_name, e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error creating Sheets service: {e}")
+            logger.error("Unexpected error creating %s service: %s", display_name, e)
             raise
-
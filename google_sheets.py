@@ -30,15 +30,17 @@ class GoogleSheetsManager:
                 self.sheets_service = self.auth_manager.get_sheets_service()
             logger.info("Google services initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize Google services: {e}")
+            logger.error("Failed to initialize Google services: %s", e)
             raise
     
-    def copy_template_sheet(self, template_id=None):
+    def copy_template_sheet(self, template_id=None, name=None, folder_id=None):
         """
         Create a copy of the template Google Sheet.
         
         Args:
             template_id (str, optional): Template sheet ID. Uses config default if not provided.
+            name (str, optional): Name for the copy. A temporary name is used if not provided.
+            folder_id (str, optional): Folder to create the copy in. Drive's default if not provided.
             
         Returns:
             str: ID of the newly created sheet.
@@ -52,28 +54,31 @@ class GoogleSheetsManager:
         template_id = template_id or Config.TEMPLATE_SHEET_ID
         
         try:
-            logger.info(f"Copying template sheet: {template_id}")
+            logger.info("Copying template sheet: %s", template_id)
             
-            # Copy the file
+            # Copy the file; name and parent folder are set in the same call when given
             file_metadata = {
-                'name': 'QA Test Plan (Copy)'  # Temporary name, will be renamed
+                'name': name or 'QA Test Plan (Copy)'  # Temporary name, will be renamed
             }
+            if folder_id:
+                file_metadata['parents'] = [folder_id]
             
             copied_file = self.drive_service.files().copy(
                 fileId=template_id,
-                body=file_metadata
+                body=file_metadata,
+                fields='id'
             ).execute()
             
             new_sheet_id = copied_file.get('id')
-            logger.info(f"Successfully created copy with ID: {new_sheet_id}")
+            logger.info("Successfully created copy with ID: %s", new_sheet_id)
             
             return new_sheet_id
             
         except HttpError as e:
-            logger.error(f"Failed to copy template sheet: {e}")
+            logger.error("Failed to copy template sheet: %s", e)
             raise Exception(f"Failed to copy template sheet: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error copying template: {e}")
+            logger.error("Unexpected error copying template: %s", e)
             raise
     
     def rename_sheet(self, sheet_id, new_name):
@@ -94,7 +99,7 @@ class GoogleSheetsManager:
             self.initialize_services()
         
         try:
-            logger.info(f"Renaming sheet {sheet_id} to '{new_name}'")
+            logger.info("Renaming sheet %s to '%s'", sheet_id, new_name)
             
             file_metadata = {
                 'name': new_name
@@ -105,14 +110,14 @@ class GoogleSheetsManager:
                 body=file_metadata
             ).execute()
             
-            logger.info(f"Successfully renamed sheet to '{new_name}'")
+            logger.info("Successfully renamed sheet to '%s'", new_name)
             return True
             
         except HttpError as e:
-            logger.error(f"Failed to rename sheet: {e}")
+            logger.error("Failed to rename sheet: %s", e)
             raise Exception(f"Failed to rename sheet: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error renaming sheet: {e}")
+            logger.error("Unexpected error renaming sheet: %s", e)
             raise
     
     def move_sheet_to_folder(self, sheet_id, folder_id=None):
@@ -135,7 +140,7 @@ class GoogleSheetsManager:
         folder_id = folder_id or Config.DESTINATION_FOLDER_ID
         
         try:
-            logger.info(f"Moving sheet {sheet_id} to folder {folder_id}")
+            logger.info("Moving sheet %s to folder %s", sheet_id, folder_id)
             
             # Retrieve the existing parents to remove
             file = self.drive_service.files().get(
@@ -153,14 +158,14 @@ class GoogleSheetsManager:
                 fields='id, parents'
             ).execute()
             
-            logger.info(f"Successfully moved sheet to folder {folder_id}")
+            logger.info("Successfully moved sheet to folder %s", folder_id)
             return True
             
         except HttpError as e:
-            logger.error(f"Failed to move sheet to folder: {e}")
+            logger.error("Failed to move sheet to folder: %s", e)
             raise Exception(f"Failed to move sheet to folder: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error moving sheet: {e}")
+            logger.error("Unexpected error moving sheet: %s", e)
             raise
     
     def get_sheet_url(self, sheet_id):
@@ -173,18 +178,15 @@ class GoogleSheetsManager:
         Returns:
             str: URL to the Google Sheet.
         """
-        url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit"
-        logger.info(f"Generated sheet URL: {url}")
-        return url
+        return f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit"
     
     def create_qa_test_plan(self, jira_issue_key):
         """
         Create a complete QA test plan sheet for a Jira issue.
         
-        This is the main workflow method that:
-        1. Copies the template
-        2. Renames it with the Jira issue key
-        3. Moves it to the destination folder
+        This is the main workflow method that copies the template straight into the
+        destination folder under a name containing the Jira issue key, in a single
+        Drive call.
         
         Args:
             jira_issue_key (str): The Jira issue key (e.g., "MTP-1234").
@@ -196,22 +198,19 @@ class GoogleSheetsManager:
             Exception: If any step fails.
         """
         try:
-            logger.info(f"Creating QA test plan for {jira_issue_key}")
-            
-            # Step 1: Copy the template
-            new_sheet_id = self.copy_template_sheet()
+            logger.info("Creating QA test plan for %s", jira_issue_key)
             
-            # Step 2: Rename the sheet
+            # Step 1: Copy the template, already named and placed in the destination folder
             new_name = f"{jira_issue_key} - QA Test Plan"
-            self.rename_sheet(new_sheet_id, new_name)
+            new_sheet_id = self.copy_template_sheet(
+                name=new_name,
+                folder_id=Config.DESTINATION_FOLDER_ID
+            )
             
-            # Step 3: Move to destination folder
-            self.move_sheet_to_folder(new_sheet_id)
-            
-            # Step 4: Get the URL
+            # Step 2: Get the URL
             sheet_url = self.get_sheet_url(new_sheet_id)
             
-            logger.info(f"Successfully created QA test plan: {sheet_url}")
+            logger.info("Successfully created QA test plan: %s", sheet_url)
             
             return {
                 'sheet_id': new_sheet_id,
@@ -219,6 +218,5 @@ class GoogleSheetsManager:
             }
             
         except Exception as e:
-            logger.error(f"Failed to create QA test plan: {e}")
+            logger.error("Failed to create QA test plan: %s", e)
             raise
-
@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration for production deployments.
+Serves the app from one process with threaded workers and warms services before traffic.
+"""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# One process so the in-process webhook idempotency keys and caches are shared by
+# every request; threads provide the concurrency
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = 'gthread'
+workers = 1
+threads = 8
+
+
+def post_worker_init(worker):
+    """
+    Authenticate with Google and open the Jira connection pool once the app is loaded,
+    so the first webhook a worker receives does not pay for it.
+    
+    Args:
+        worker: The initialized gunicorn worker.
+    """
+    from app import initialize_app
+    
+    try:
+        initialize_app()
+    except Exception as e:
+        # Services are created on demand anyway; let the worker start serving
+        logger.warning("Worker warm-up failed, services will initialize on first use: %s", e)
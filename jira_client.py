@@ -3,14 +3,78 @@ Jira API client module.
 Handles communication with Jira REST API.
 """
 import logging
+import re
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 
 from config import Config
+from ttl_cache import TTLCache
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Prefix of the Jira comment that records a created QA test plan
+QA_PLAN_COMMENT_PREFIX = "QA Test Plan has been created:"
+
+# Jira issue keys: project key (uppercase letter, then letters, digits or underscores),
+# a hyphen and the issue number
+ISSUE_KEY_PATTERN = re.compile(r'^[A-Z][A-Z0-9_]+-\d+$')
+
+# Custom fields read by the QA test plan workflow
+GOALS_FIELD = 'customfield_10040'
+CUSTOM_ATTRIBUTES_FIELD = 'customfield_10777'
+
+# Only the fields the QA test plan workflow reads: the duplicate check (comment),
+# platform detection (labels), and the Goals and Custom attributes fields
+QA_PLAN_FIELDS = f'labels,comment,{GOALS_FIELD},{CUSTOM_ATTRIBUTES_FIELD}'
+
+# Seconds a fetched issue is served from cache before it is revalidated with Jira
+ISSUE_CACHE_TTL = 60
+
+# Comment request body (Atlassian Document Format) serialized once around the text
+# slot, so each comment only encodes its own text
+_COMMENT_TEXT_SLOT = b'"__COMMENT_TEXT__"'
+_COMMENT_BODY_HEAD, _, _COMMENT_BODY_TAIL = orjson.dumps({
+    "body": {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "__COMMENT_TEXT__"
+                    }
+                ]
+            }
+        ]
+    }
+}).partition(_COMMENT_TEXT_SLOT)
+
+
+# Deepest ADF nesting converted to text; anything below is dropped rather than
+# recursing further (real Goals documents nest a handful of levels)
+ADF_MAX_DEPTH = 100
+
+
+def _validate_issue_key(issue_key):
+    """
+    Reject malformed issue keys before they cost a round trip to Jira.
+    
+    Args:
+        issue_key (str): The Jira issue key (e.g., "MTP-1234").
+        
+    Raises:
+        ValueError: If the key is not a valid Jira issue key.
+    """
+    if not isinstance(issue_key, str) or not ISSUE_KEY_PATTERN.match(issue_key):
+        raise ValueError(f"Invalid Jira issue key: {issue_key!r}")
+
 
 class JiraClient:
     """Client for interacting with Jira REST API."""
@@ -18,13 +82,77 @@ class JiraClient:
     def __init__(self):
         """Initialize the Jira client."""
         self.base_url = Config.JIRA_URL.rstrip('/')
+        self.myself_url = f"{self.base_url}/rest/api/3/myself"
+        self.issue_url_prefix = f"{self.base_url}/rest/api/3/issue/"
         self.username = Config.JIRA_USERNAME
         self.api_token = Config.JIRA_API_TOKEN
         self.auth = HTTPBasicAuth(self.username, self.api_token)
+        # GETs carry no body, so only requests that send JSON declare a Content-Type
         self.headers = {
-            'Accept': 'application/json',
+            'Accept': 'application/json'
+        }
+        self.post_headers = {
             'Content-Type': 'application/json'
         }
+        
+        # Shared session so calls reuse pooled keep-alive connections to Jira
+        # instead of paying a TCP + TLS handshake each time
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
+        # Idempotent requests are retried on throttling and transient server errors with
+        # exponential backoff, honouring Jira's Retry-After on 429/503. POSTs (comments)
+        # are not retried, so a slow 5xx can never post the same comment twice.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        # One host, so one pool; its size bounds the keep-alive sockets shared by all threads
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=50, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Fetched issues by key, then by requested fields: (etag, issue data, fresh-until).
+        # Entries outlive their freshness so an ETag can still revalidate them with a
+        # bodiless 304.
+        self._issue_cache = TTLCache(maxsize=1024, ttl=3600)
+    
+    def close(self):
+        """Close the pooled connections held by the session."""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def invalidate(self, issue_key):
+        """
+        Drop every cached copy of an issue, e.g. after changing it.
+        
+        Args:
+            issue_key (str): The Jira issue key (e.g., "MTP-1234").
+        """
+        self._issue_cache.pop(issue_key)
+    
+    def clear_cache(self):
+        """Drop all cached issues."""
+        self._issue_cache.clear()
+    
+    def warm_connection(self):
+        """
+        Open a pooled connection to Jira ahead of the first webhook.
+        
+        Failures are logged and ignored; the next real call simply connects itself.
+        """
+        try:
+            self.session.head(self.base_url, timeout=5)
+            logger.info("Jira connection pool warmed")
+        except requests.exceptions.RequestException as e:
+            logger.warning("Could not warm Jira connection: %s", e)
     
     def validate_credentials(self):
         """
@@ -38,12 +166,10 @@ class JiraClient:
         """
         try:
             logger.info("Validating Jira credentials")
-            url = f"{self.base_url}/rest/api/3/myself"
+            url = self.myself_url
             
-            response = requests.get(
+            response = self.session.get(
                 url,
-                headers=self.headers,
-                auth=self.auth,
                 timeout=10
             )
             
@@ -55,50 +181,77 @@ class JiraClient:
             if e.response.status_code == 401:
                 logger.error("Invalid Jira credentials")
                 raise Exception("Invalid Jira credentials")
-            logger.error(f"HTTP error validating credentials: {e}")
+            logger.error("HTTP error validating credentials: %s", e)
             raise
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to connect to Jira: {e}")
+            logger.error("Failed to connect to Jira: %s", e)
             raise
     
-    def get_issue(self, issue_key):
+    def get_issue(self, issue_key, fields=None):
         """
         Get details of a Jira issue.
         
+        Issues are cached for ISSUE_CACHE_TTL seconds; after that a cached issue is
+        revalidated with If-None-Match when Jira supplied an ETag.
+        
         Args:
             issue_key (str): The Jira issue key (e.g., "MTP-1234").
+            fields (str or list, optional): Fields to return, comma-separated or as a list
+                (e.g., QA_PLAN_FIELDS). All fields are returned if not provided.
             
         Returns:
             dict: Issue data from Jira API.
             
         Raises:
+            ValueError: If the issue key is malformed.
             Exception: If issue cannot be retrieved.
         """
+        _validate_issue_key(issue_key)
+        if fields is not None and not isinstance(fields, str):
+            fields = ','.join(fields)
+        
+        cached = (self._issue_cache.get(issue_key) or {}).get(fields)
+        if cached and cached[2] > time.monotonic():
+            logger.info("Using cached Jira issue: %s", issue_key)
+            return cached[1]
+        
         try:
-            logger.info(f"Fetching Jira issue: {issue_key}")
-            url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
+            logger.info("Fetching Jira issue: %s", issue_key)
+            url = self.issue_url_prefix + issue_key
             
-            response = requests.get(
+            params = {'fields': fields} if fields else None
+            headers = {'If-None-Match': cached[0]} if cached and cached[0] else None
+            response = self.session.get(
                 url,
-                headers=self.headers,
-                auth=self.auth,
+                params=params,
+                headers=headers,
                 timeout=10
             )
             
-            response.raise_for_status()
-            issue_data = response.json()
-            
-            logger.info(f"Successfully fetched issue: {issue_key}")
+            if response.status_code == 304:
+                issue_data = cached[1]
+                logger.info("Jira issue unchanged: %s", issue_key)
+            else:
+                response.raise_for_status()
+                issue_data = orjson.loads(response.content)
+            
+            variants = dict(self._issue_cache.get(issue_key) or {})
+            variants[fields] = (
+                response.headers.get('ETag') or (cached[0] if cached else None),
+                issue_data,
+                time.monotonic() + ISSUE_CACHE_TTL
+            )
+            self._issue_cache.set(issue_key, variants)
             return issue_data
             
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
-                logger.error(f"Issue not found: {issue_key}")
+                logger.error("Issue not found: %s", issue_key)
                 raise Exception(f"Issue not found: {issue_key}")
-            logger.error(f"HTTP error fetching issue: {e}")
+            logger.error("HTTP error fetching issue: %s", e)
             raise
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to fetch issue: {e}")
+            logger.error("Failed to fetch issue: %s", e)
             raise
     
     def add_comment(self, issue_key, comment_text):
@@ -113,51 +266,40 @@ class JiraClient:
             dict: Comment data from Jira API.
             
         Raises:
+            ValueError: If the issue key is malformed.
             Exception: If comment cannot be added.
         """
+        _validate_issue_key(issue_key)
+        
         try:
-            logger.info(f"Adding comment to issue: {issue_key}")
-            url = f"{self.base_url}/rest/api/3/issue/{issue_key}/comment"
-            
-            payload = {
-                "body": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": comment_text
-                                }
-                            ]
-                        }
-                    ]
-                }
-            }
+            logger.info("Adding comment to issue: %s", issue_key)
+            url = self.issue_url_prefix + issue_key + '/comment'
+            
+            payload = _COMMENT_BODY_HEAD + orjson.dumps(comment_text) + _COMMENT_BODY_TAIL
             
-            response = requests.post(
+            response = self.session.post(
                 url,
-                headers=self.headers,
-                auth=self.auth,
-                json=payload,
+                data=payload,
+                headers=self.post_headers,
                 timeout=10
             )
             
             response.raise_for_status()
-            comment_data = response.json()
+            comment_data = orjson.loads(response.content)
+            
+            # The cached issue no longer lists every comment
+            self.invalidate(issue_key)
             
-            logger.info(f"Successfully added comment to issue: {issue_key}")
+            logger.info("Successfully added comment to issue: %s", issue_key)
             return comment_data
             
         except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP error adding comment: {e}")
+            logger.error("HTTP error adding comment: %s", e)
             if hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             raise Exception(f"Failed to add comment to Jira: {e}")
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to add comment: {e}")
+            logger.error("Failed to add comment: %s", e)
             raise
     
     def post_qa_plan_comment(self, issue_key, sheet_url):
@@ -174,100 +316,119 @@ class JiraClient:
         Raises:
             Exception: If comment cannot be added.
         """
-        comment_text = f"QA Test Plan has been created: {sheet_url}"
+        comment_text = f"{QA_PLAN_COMMENT_PREFIX} {sheet_url}"
         return self.add_comment(issue_key, comment_text)
     
-    def get_goals_field(self, issue_key):
+    def get_goals_field(self, issue_key, issue_data=None):
         """
         Extract the Goals field from a Jira issue.
         
         Args:
             issue_key (str): The Jira issue key (e.g., "MTP-1234").
+            issue_data (dict, optional): Already-fetched issue data. Fetched from Jira if not provided.
             
         Returns:
             str: The Goals field text, or empty string if not found.
         """
         try:
-            logger.info(f"Fetching Goals field for issue: {issue_key}")
-            
-            # Get the issue data
-            issue_data = self.get_issue(issue_key)
-            fields = issue_data.get('fields', {})
-            
-            # Look for the Goals custom field (customfield_10040)
-            goals_field = fields.get('customfield_10040')
-            
-            if goals_field:
-                logger.info(f"Found Goals field in customfield_10040")
-                
-                # Handle different field types
-                if isinstance(goals_field, str):
-                    return goals_field
-                elif isinstance(goals_field, dict):
-                    # Handle ADF document format
-                    if 'content' in goals_field:
-                        converted_text = self._convert_adf_to_text(goals_field)
-                        return converted_text
-                    return str(goals_field)
-                else:
-                    return str(goals_field) if goals_field else ''
+            logger.info("Fetching Goals field for issue: %s", issue_key)
             
-            logger.warning(f"No Goals field found for issue: {issue_key}")
-            return ''
+            # Get the issue data unless the caller already has it
+            if issue_data is None:
+                issue_data = self.get_issue(issue_key, fields=QA_PLAN_FIELDS)
+            
+            goals_text = self.get_goals_field_from_data(issue_data)
+            if not goals_text:
+                logger.warning("No Goals field found for issue: %s", issue_key)
+            return goals_text
             
         except Exception as e:
-            logger.error(f"Error fetching Goals field: {e}")
+            logger.error("Error fetching Goals field: %s", e)
             return ''
     
-    def get_custom_attributes_field(self, issue_key):
+    def get_goals_field_from_data(self, issue_data):
+        """
+        Extract the Goals field (customfield_10040) from already-fetched issue data.
+        
+        Args:
+            issue_data (dict): Issue data from Jira API.
+            
+        Returns:
+            str: The Goals field text, or empty string if not found.
+        """
+        return self._get_field_text(issue_data, GOALS_FIELD)
+    
+    def get_custom_attributes_field(self, issue_key, issue_data=None):
         """
         Extract the Custom attributes field from a Jira issue.
         
         Args:
             issue_key (str): The Jira issue key (e.g., "MTP-1234").
+            issue_data (dict, optional): Already-fetched issue data. Fetched from Jira if not provided.
             
         Returns:
             str: The Custom attributes field text, or empty string if not found.
         """
         try:
-            logger.info(f"Fetching Custom attributes field for issue: {issue_key}")
-            
-            # Get the issue data
-            issue_data = self.get_issue(issue_key)
-            fields = issue_data.get('fields', {})
-            
-            # Look for the Custom attributes custom field (customfield_10777)
-            custom_attributes_field = fields.get('customfield_10777')
-            
-            if custom_attributes_field:
-                logger.info(f"Found Custom attributes field in customfield_10777")
-                
-                # Handle different field types
-                if isinstance(custom_attributes_field, str):
-                    return custom_attributes_field
-                elif isinstance(custom_attributes_field, dict):
-                    # Handle ADF document format
-                    if 'content' in custom_attributes_field:
-                        converted_text = self._convert_adf_to_text(custom_attributes_field)
-                        return converted_text
-                    return str(custom_attributes_field)
-                else:
-                    return str(custom_attributes_field) if custom_attributes_field else ''
+            logger.info("Fetching Custom attributes field for issue: %s", issue_key)
             
-            logger.warning(f"No Custom attributes field found for issue: {issue_key}")
-            return ''
+            # Get the issue data unless the caller already has it
+            if issue_data is None:
+                issue_data = self.get_issue(issue_key, fields=QA_PLAN_FIELDS)
+            
+            custom_attributes_text = self.get_custom_attributes_field_from_data(issue_data)
+            if not custom_attributes_text:
+                logger.warning("No Custom attributes field found for issue: %s", issue_key)
+            return custom_attributes_text
             
         except Exception as e:
-            logger.error(f"Error fetching Custom attributes field: {e}")
+            logger.error("Error fetching Custom attributes field: %s", e)
+            return ''
+    
+    def get_custom_attributes_field_from_data(self, issue_data):
+        """
+        Extract the Custom attributes field (customfield_10777) from already-fetched issue data.
+        
+        Args:
+            issue_data (dict): Issue data from Jira API.
+            
+        Returns:
+            str: The Custom attributes field text, or empty string if not found.
+        """
+        return self._get_field_text(issue_data, CUSTOM_ATTRIBUTES_FIELD)
+    
+    def _get_field_text(self, issue_data, field_id):
+        """
+        Read a text custom field from issue data, converting ADF documents to plain text.
+        
+        Args:
+            issue_data (dict): Issue data from Jira API.
+            field_id (str): Custom field ID (e.g., GOALS_FIELD).
+            
+        Returns:
+            str: The field text, or empty string if not found.
+        """
+        field_value = issue_data.get('fields', {}).get(field_id)
+        if not field_value:
             return ''
+        
+        logger.info("Found field %s", field_id)
+        
+        # Handle different field types
+        if isinstance(field_value, dict) and 'content' in field_value:
+            # Handle ADF document format
+            return self._convert_adf_to_text(field_value)
+        return field_value if isinstance(field_value, str) else str(field_value)
     
-    def _convert_adf_to_text(self, adf_document, depth=0):
+    def _convert_adf_to_text(self, adf_document):
         """
         Convert Atlassian Document Format (ADF) to plain text.
         
+        Every node appends its text to one shared buffer that is joined once at the
+        end, instead of each level building and joining its own string.
+        
         Args:
             adf_document (dict): ADF document structure.
-            depth (int): Current nesting depth.
             
         Returns:
             str: Plain text representation.
@@ -280,87 +441,88 @@ class JiraClient:
             if not content:
                 return ''
             
-            text_parts = []
-            
+            out = []
             for node in content:
-                text_parts.append(self._extract_text_from_adf_node(node, depth))
+                # Top-level blocks are newline-separated; empty ones are skipped
+                mark = len(out)
+                if out:
+                    out.append('\n')
+                start = len(out)
+                self._append_adf_node_text(node, out, 0)
+                if len(out) == start:
+                    del out[mark:]
             
-            return '\n'.join(filter(None, text_parts))
+            return ''.join(out)
             
         except Exception as e:
-            logger.warning(f"Failed to convert ADF to text: {e}")
+            logger.warning("Failed to convert ADF to text: %s", e)
             return str(adf_document)
     
-    def _extract_text_from_adf_node(self, node, depth=0):
+    def _append_adf_node_text(self, node, out, depth):
         """
-        Extract text from a single ADF node.
+        Append the text of a single ADF node (and its children) to a buffer.
+        
+        Only non-empty strings are appended, so a node rendered nothing exactly when
+        the buffer length is unchanged.
         
         Args:
             node (dict): ADF node.
+            out (list): Buffer of text fragments.
             depth (int): Current nesting depth.
-            
-        Returns:
-            str: Extracted text.
         """
+        if not isinstance(node, dict) or depth > ADF_MAX_DEPTH:
+            return
+        
+        mark = len(out)
         try:
-            if not isinstance(node, dict):
-                return ''
-            
             node_type = node.get('type', '')
             content = node.get('content', [])
-            text = node.get('text', '')
             
-            # Handle different node types
-            if node_type == 'paragraph':
-                if content:
-                    paragraph_text = ''.join(self._extract_text_from_adf_node(child, depth) for child in content)
-                    return paragraph_text
-                else:
-                    return text or ''
+            if node_type == 'text':
+                text = node.get('text')
+                if text:
+                    out.append(text)
             
-            elif node_type == 'text':
-                return text or ''
+            elif node_type == 'hardBreak':
+                out.append('\n')
             
             elif node_type == 'heading':
                 level = node.get('attrs', {}).get('level', 1)
-                heading_text = ''.join(self._extract_text_from_adf_node(child, depth) for child in content) if content else text or ''
-                return f"{'#' * level} {heading_text}"
-            
-            elif node_type == 'bulletList':
-                items = []
-                for item in content:
-                    item_content = item.get('content', [])
-                    item_text = ''.join(self._extract_text_from_adf_node(child, depth) for child in item_content)
-                    if item_text:
-                        items.append(f"- {item_text}")
-                return '\n'.join(items)
-            
-            elif node_type == 'orderedList':
-                items = []
-                for index, item in enumerate(content, start=1):
-                    item_content = item.get('content', [])
-                    item_text = ''.join(self._extract_text_from_adf_node(child, depth) for child in item_content)
-                    if item_text:
-                        items.append(f"{index}. {item_text}")
-                return '\n'.join(items)
-            
-            elif node_type == 'listItem':
-                # Get the parent's order to determine numbering
-                # This is a simplified approach - just extract content
-                item_text = ''.join(self._extract_text_from_adf_node(child) for child in content)
-                return item_text
+                out.append(f"{'#' * level} ")
+                if content:
+                    for child in content:
+                        self._append_adf_node_text(child, out, depth + 1)
+                else:
+                    text = node.get('text')
+                    if text:
+                        out.append(text)
             
-            elif node_type == 'hardBreak':
-                return '\n'
+            elif node_type == 'bulletList' or node_type == 'orderedList':
+                ordered = node_type == 'orderedList'
+                for index, item in enumerate(content, start=1):
+                    # Items are newline-separated; an item that renders nothing is dropped
+                    item_mark = len(out)
+                    if item_mark > mark:
+                        out.append('\n')
+                    out.append(f"{index}. " if ordered else '- ')
+                    item_start = len(out)
+                    for child in item.get('content', []):
+                        self._append_adf_node_text(child, out, depth + 1)
+                    if len(out) == item_start:
+                        del out[item_mark:]
+            
+            elif content or node_type == 'listItem':
+                # Paragraphs, list items and unknown node types: concatenate the children.
+                # Numbering comes from the parent list, and a bare item has no own text.
+                for child in content:
+                    self._append_adf_node_text(child, out, depth + 1)
             
             else:
-                # For unknown node types, try to extract text from content
-                if content:
-                    return ''.join(self._extract_text_from_adf_node(child, depth) for child in content)
-                else:
-                    return text or ''
-                    
+                text = node.get('text')
+                if text:
+                    out.append(text)
+        
         except Exception as e:
-            logger.warning(f"Failed to extract text from ADF node: {e}")
-            return ''
-
+            logger.warning("Failed to extract text from ADF node: %s", e)
+            # A node that fails renders nothing, as if it were empty
+            del out[mark:]
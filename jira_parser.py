@@ -4,27 +4,75 @@ Extracts platform and goals from Jira tickets.
 """
 import logging
 import re
+from functools import cached_property
 from typing import List, Optional
 
-from jira_client import JiraClient
+from jira_client import JiraClient, QA_PLAN_FIELDS
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Number prefix ("1. ") that starts each numbered section; sections are split on it
+NUMBER_PREFIX_PATTERN = re.compile(r'\d+\.\s+')
+
+# Platform tab to customize, by lowercased Jira label (exact match)
+_TAB_BY_LABEL = {
+    'convert': "[Convert] QA Pass 1",
+    'optimizely': "[Optimizely] QA Pass 1",
+    'vwo': "[VWO] QA Pass 1",
+    'monetate': "[Monetate] QA Pass 1"
+}
+DEFAULT_PLATFORM_TAB = "[Optimizely] QA Pass 1"
+
+
+def _split_numbered_sections(text: str) -> List[str]:
+    """
+    Split text into its numbered sections in one linear scan.
+    
+    Args:
+        text (str): Field text such as "1. First goal 2. Second goal".
+        
+    Returns:
+        list: Section strings with their "1. " "2. " etc. prefixes stripped, ready to
+              insert into the sheet. Empty sections are dropped.
+    """
+    sections = []
+    # Anything before the first number prefix is not a section
+    for part in NUMBER_PREFIX_PATTERN.split(text)[1:]:
+        section_text = part.strip()
+        if section_text:
+            sections.append(section_text)
+            logger.debug("Parsed section: %.100s...", section_text)
+    return sections
+
 
 class JiraTicketParser:
     """Parses Jira ticket data to extract information for sheet customization."""
     
-    def __init__(self):
-        """Initialize the parser with Jira client."""
-        self.jira_client = JiraClient()
+    def __init__(self, jira_client: Optional[JiraClient] = None):
+        """
+        Initialize the parser with Jira client.
+        
+        Args:
+            jira_client (JiraClient, optional): Client to fetch issues with, so the parser
+                shares its connection pool and issue cache. A new client is created on
+                first use if not provided.
+        """
+        if jira_client is not None:
+            self.jira_client = jira_client
+    
+    @cached_property
+    def jira_client(self) -> JiraClient:
+        """JiraClient created on first use, so parse-only callers never open a session."""
+        return JiraClient()
     
-    def extract_platform_from_labels(self, issue_key: str) -> str:
+    def extract_platform_from_labels(self, issue_key: str, issue_data: Optional[dict] = None) -> str:
         """
         Extract platform from Jira issue labels.
         
         Args:
             issue_key (str): The Jira issue key (e.g., "MTP-1234").
+            issue_data (dict, optional): Already-fetched issue data. Fetched from Jira if not provided.
             
         Returns:
             str: Tab name matching the platform ("[Optimizely] QA Pass 1", "[Convert] QA Pass 1",
@@ -32,119 +80,88 @@ class JiraTicketParser:
                  "[Optimizely] QA Pass 1" if no match found.
         """
         try:
-            logger.info(f"Extracting platform from labels for issue: {issue_key}")
+            logger.info("Extracting platform from labels for issue: %s", issue_key)
             
-            # Get the issue data
-            issue_data = self.jira_client.get_issue(issue_key)
+            # Get the issue data unless the caller already has it
+            if issue_data is None:
+                issue_data = self.jira_client.get_issue(issue_key, fields=QA_PLAN_FIELDS)
             labels = issue_data.get('fields', {}).get('labels', [])
             
             # Check for exact matches in labels (case-insensitive)
-            logger.info(f"Checking {len(labels)} labels for platform: {labels}")
+            logger.debug("Checking %s labels for platform: %s", len(labels), labels)
             for label in labels:
-                label_lower = label.lower().strip()
-                
-                if label_lower == 'convert':
-                    logger.info(f"Found Convert platform from label: {label}")
-                    return "[Convert] QA Pass 1"
-                elif label_lower == 'optimizely':
-                    logger.info(f"Found Optimizely platform from label: {label}")
-                    return "[Optimizely] QA Pass 1"
-                elif label_lower == 'vwo':
-                    logger.info(f"Found VWO platform from label: {label}")
-                    return "[VWO] QA Pass 1"
-                elif label_lower == 'monetate':
-                    logger.info(f"Found Monetate platform from label: {label}")
-                    return "[Monetate] QA Pass 1"
+                tab_name = _TAB_BY_LABEL.get(label.lower().strip())
+                if tab_name:
+                    logger.info("Found %s platform from label: %s", tab_name, label)
+                    return tab_name
             
             # No match found, default to Optimizely
-            logger.info(f"No matching platform label found in {labels}, defaulting to [Optimizely] QA Pass 1")
-            return "[Optimizely] QA Pass 1"
+            logger.info("No matching platform label found in %s, defaulting to %s", labels, DEFAULT_PLATFORM_TAB)
+            return DEFAULT_PLATFORM_TAB
             
         except Exception as e:
-            logger.error(f"Error extracting platform from labels: {e}")
+            logger.error("Error extracting platform from labels: %s", e)
             # Default to Optimizely on error
-            return "[Optimizely] QA Pass 1"
+            return DEFAULT_PLATFORM_TAB
     
-    def parse_goals_field(self, issue_key: str) -> List[str]:
+    def parse_goals_field(self, issue_key: str, issue_data: Optional[dict] = None) -> List[str]:
         """
         Parse the Goals field from a Jira issue into numbered sections.
         
         Args:
             issue_key (str): The Jira issue key (e.g., "MTP-1234").
+            issue_data (dict, optional): Already-fetched issue data. Fetched from Jira if not provided.
             
         Returns:
             list: List of goal strings, each containing all content for that numbered goal.
                   Returns empty list if no Goals field found or empty.
         """
         try:
-            logger.info(f"Parsing Goals field for issue: {issue_key}")
+            logger.info("Parsing Goals field for issue: %s", issue_key)
             
             # Get the Goals field text
-            goals_text = self.jira_client.get_goals_field(issue_key)
+            goals_text = self.jira_client.get_goals_field(issue_key, issue_data=issue_data)
             
             if not goals_text or not goals_text.strip():
-                logger.info(f"No Goals field found or empty for issue: {issue_key}")
+                logger.info("No Goals field found or empty for issue: %s", issue_key)
                 return []
             
-            # Parse numbered goals using reliable regex pattern
-            # Keep the numbering detection but strip prefix before inserting into sheet
-            goal_pattern = r'(\d+\.\s+.+?)(?=\d+\.\s+|$)'
-            matches = re.findall(goal_pattern, goals_text, re.DOTALL)
-            
-            goals = []
-            for match in matches:
-                goal_text = match.strip()
-                if goal_text:
-                    # Strip the "1. " "2. " etc. prefix before inserting
-                    goal_text = re.sub(r'^\d+\.\s+', '', goal_text)
-                    goals.append(goal_text)
-                    logger.debug(f"Parsed goal: {goal_text[:100]}...")
-            
-            logger.info(f"Successfully parsed {len(goals)} goals from Goals field")
+            goals = _split_numbered_sections(goals_text)
+            
+            logger.info("Successfully parsed %s goals from Goals field", len(goals))
             return goals
             
         except Exception as e:
-            logger.error(f"Error parsing Goals field: {e}")
+            logger.error("Error parsing Goals field: %s", e)
             return []
     
-    def parse_custom_attributes_field(self, issue_key: str) -> List[str]:
+    def parse_custom_attributes_field(self, issue_key: str, issue_data: Optional[dict] = None) -> List[str]:
         """
         Parse the Custom attributes field from a Jira issue into numbered sections.
         
         Args:
             issue_key (str): The Jira issue key (e.g., "MTP-1234").
+            issue_data (dict, optional): Already-fetched issue data. Fetched from Jira if not provided.
             
         Returns:
             list: List of custom attribute strings, each containing all content for that numbered attribute.
                   Returns empty list if no Custom attributes field found or empty.
         """
         try:
-            logger.info(f"Parsing Custom attributes field for issue: {issue_key}")
+            logger.info("Parsing Custom attributes field for issue: %s", issue_key)
             
             # Get the Custom attributes field text
-            custom_attributes_text = self.jira_client.get_custom_attributes_field(issue_key)
+            custom_attributes_text = self.jira_client.get_custom_attributes_field(issue_key, issue_data=issue_data)
             
             if not custom_attributes_text or not custom_attributes_text.strip():
-                logger.info(f"No Custom attributes field found or empty for issue: {issue_key}")
+                logger.info("No Custom attributes field found or empty for issue: %s", issue_key)
                 return []
             
-            # Parse numbered custom attributes using reliable regex pattern
-            # Keep the numbering detection but strip prefix before inserting into sheet
-            attribute_pattern = r'(\d+\.\s+.+?)(?=\d+\.\s+|$)'
-            matches = re.findall(attribute_pattern, custom_attributes_text, re.DOTALL)
-            
-            custom_attributes = []
-            for match in matches:
-                attribute_text = match.strip()
-                if attribute_text:
-                    # Strip the "1. " "2. " etc. prefix before inserting
-                    attribute_text = re.sub(r'^\d+\.\s+', '', attribute_text)
-                    custom_attributes.append(attribute_text)
-                    logger.debug(f"Parsed custom attribute: {attribute_text[:100]}...")
-            
-            logger.info(f"Successfully parsed {len(custom_attributes)} custom attributes from Custom attributes field")
+            custom_attributes = _split_numbered_sections(custom_attributes_text)
+            
+            logger.info("Successfully parsed %s custom attributes from Custom attributes field", len(custom_attributes))
             return custom_attributes
             
         except Exception as e:
-            logger.error(f"Error parsing Custom attributes field: {e}")
-            return []
\ No newline at end of file
+            logger.error("Error parsing Custom attributes field: %s", e)
+            return []
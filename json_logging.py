@@ -0,0 +1,60 @@
+"""
+Structured JSON logging for the serverless entry points.
+Each record is written as one orjson-encoded line that CloudWatch and Cloud Logging parse natively.
+"""
+import logging
+import sys
+
+import orjson
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats log records as single-line JSON objects."""
+    
+    def format(self, record):
+        """
+        Format a log record as JSON.
+        
+        Args:
+            record (logging.LogRecord): The record to format.
+        
+        Returns:
+            str: The record as one line of JSON.
+        """
+        entry = {
+            'timestamp': self.formatTime(record),
+            'severity': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        
+        # The Lambda runtime tags records with the invocation's request ID
+        request_id = getattr(record, 'aws_request_id', None)
+        if request_id:
+            entry['request_id'] = request_id
+        
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        
+        return orjson.dumps(entry, default=str).decode('utf-8')
+
+
+def configure_json_logging(level=logging.INFO):
+    """
+    Switch the root logger's handlers to JSON output.
+    
+    Handlers the platform installed (e.g., the Lambda runtime's) are kept and only
+    reformatted; a stdout handler is added if there are none.
+    
+    Args:
+        level (int): Root logger level.
+    """
+    root = logging.getLogger()
+    root.setLevel(level)
+    
+    if not root.handlers:
+        root.addHandler(logging.StreamHandler(sys.stdout))
+    
+    formatter = JsonFormatter()
+    for log_handler in root.handlers:
+        log_handler.setFormatter(formatter)
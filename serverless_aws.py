@@ -3,13 +3,33 @@ AWS Lambda handler for the QA Test Plan automation.
 
 This module provides the Lambda function entry point for AWS deployment.
 """
-import json
 import logging
+import orjson
 from app import handler as app_handler
+from json_logging import configure_json_logging
 
-# Configure logging for AWS Lambda
+# Configure logging for AWS Lambda: one JSON object per record
+configure_json_logging(logging.INFO)
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+
+# Longest request body echoed into the invocation log
+LOGGED_BODY_LIMIT = 256
+
+
+def _event_for_log(event):
+    """
+    Return a copy of the Lambda event that is cheap to log.
+    
+    Args:
+        event (dict): Lambda event data containing the HTTP request.
+        
+    Returns:
+        dict: The event with its body truncated to LOGGED_BODY_LIMIT characters.
+    """
+    body = event.get('body')
+    if isinstance(body, str) and len(body) > LOGGED_BODY_LIMIT:
+        event = dict(event, body=f"{body[:LOGGED_BODY_LIMIT]}... ({len(body)} chars)")
+    return event
 
 
 def lambda_handler(event, context):
@@ -23,16 +43,18 @@ def lambda_handler(event, context):
     Returns:
         dict: Response with statusCode, body, and headers.
     """
-    logger.info(f"Lambda invoked with event: {json.dumps(event)}")
+    # Only serialize the event when INFO is actually emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Lambda invoked with event: %s", orjson.dumps(_event_for_log(event), default=str).decode('utf-8'))
     
     try:
         response = app_handler(event, context)
         return response
     except Exception as e:
-        logger.error(f"Lambda handler error: {e}", exc_info=True)
+        logger.error("Lambda handler error: %s", e, exc_info=True)
         return {
             'statusCode': 500,
-            'body': json.dumps({'error': 'Internal server error'}),
+            'body': orjson.dumps({'error': 'Internal server error'}).decode('utf-8'),
             'headers': {
                 'Content-Type': 'application/json'
             }
@@ -3,21 +3,31 @@ Google Cloud Functions handler for the QA Test Plan automation.
 
 This module provides the Cloud Function entry point for GCP deployment.
 """
-import json
 import logging
+from functools import partial
 from flask import Flask, request
 
 from app import jira_webhook, health_check, test_create, initialize_app
+from json_logging import configure_json_logging
 
-# Configure logging for GCP Cloud Functions
-logging.basicConfig(level=logging.INFO)
+# Configure logging for GCP Cloud Functions: one JSON object per record, which
+# Cloud Logging parses into structured entries
+configure_json_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize the app once at cold start
 try:
     initialize_app()
 except Exception as e:
-    logger.error(f"Failed to initialize app: {e}")
+    logger.error("Failed to initialize app: %s", e)
+
+# Handler by (path, method)
+_ROUTES = {
+    ('/health', 'GET'): health_check,
+    # Cloud Functions throttle CPU after responding, so process synchronously
+    ('/webhook', 'POST'): partial(jira_webhook, run_in_background=False),
+    ('/test-create', 'POST'): test_create,
+}
 
 
 def main(request):
@@ -35,18 +45,14 @@ def main(request):
         path = request.path
         method = request.method
         
-        logger.info(f"Cloud Function invoked: {method} {path}")
+        logger.info("Cloud Function invoked: %s %s", method, path)
         
-        if path == '/health' and method == 'GET':
-            return health_check()
-        elif path == '/webhook' and method == 'POST':
-            return jira_webhook()
-        elif path == '/test-create' and method == 'POST':
-            return test_create()
-        else:
+        route_handler = _ROUTES.get((path, method))
+        if route_handler is None:
             return {'error': 'Not found'}, 404
+        return route_handler()
             
     except Exception as e:
-        logger.error(f"Cloud Function error: {e}", exc_info=True)
+        logger.error("Cloud Function error: %s", e, exc_info=True)
         return {'error': 'Internal server error'}, 500
 
@@ -39,21 +39,24 @@ def main():
     if os.path.exists('token.json'):
         print("✅ token.json already exists!")
         
-        # Load existing token
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+        # Load existing token; the same content is shown for Railway below
+        with open('token.json', 'r') as f:
+            token_content = f.read()
+        creds = Credentials.from_authorized_user_info(json.loads(token_content), SCOPES)
         
         if creds and creds.valid:
             print("✅ Valid credentials found! No setup needed.")
-            show_token_for_railway()
+            show_token_for_railway(token_content)
             return
         elif creds and creds.expired and creds.refresh_token:
             print("🔄 Refreshing expired credentials...")
             try:
                 creds.refresh(Request())
+                token_content = creds.to_json()
                 with open('token.json', 'w') as token:
-                    token.write(creds.to_json())
+                    token.write(token_content)
                 print("✅ Credentials refreshed!")
-                show_token_for_railway()
+                show_token_for_railway(token_content)
                 return
             except Exception as e:
                 print(f"❌ Failed to refresh credentials: {e}")
@@ -68,13 +71,14 @@ def main():
         creds = flow.run_local_server(port=0)
         
         # Save credentials
+        token_content = creds.to_json()
         with open('token.json', 'w') as token:
-            token.write(creds.to_json())
+            token.write(token_content)
         
         print("✅ Authentication successful!")
         print("✅ token.json created!")
         
-        show_token_for_railway()
+        show_token_for_railway(token_content)
         
     except Exception as e:
         print(f"❌ Authentication failed: {e}")
@@ -83,16 +87,12 @@ def main():
         print("- Check your internet connection")
         print("- Ensure you have access to the Google account")
 
-def show_token_for_railway():
-    """Display the token content for Railway deployment."""
+def show_token_for_railway(token_content):
+    """Display the token content (as written to token.json) for Railway deployment."""
     print("\n" + "=" * 50)
     print("🚀 READY FOR RAILWAY DEPLOYMENT!")
     print("=" * 50)
     
-    # Read token file
-    with open('token.json', 'r') as f:
-        token_content = f.read()
-    
     print("\n📋 Copy this ENTIRE content and add it to Railway:")
     print("Variable name: GOOGLE_TOKEN_JSON")
     print("Variable value:")
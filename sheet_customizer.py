@@ -3,15 +3,56 @@ Google Sheets customization module.
 Handles dynamic content insertion based on Jira ticket data.
 """
 import logging
-from typing import List
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
 
 from googleapiclient.errors import HttpError
 
 from google_auth import GoogleAuthManager
+from ttl_cache import TTLCache
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Lowercased platform tokens that identify platform tabs by title
+PLATFORM_TOKENS = ("[optimizely]", "[convert]", "[vwo]", "[monetate]")
+
+# Retries for Sheets calls. Metadata reads retry 429/5xx (googleapiclient backs off
+# exponentially between attempts). Writes retry only 429: Sheets rejects a throttled
+# batchUpdate before applying any of it, whereas a batchUpdate that failed with a 5xx
+# or timeout may already have inserted rows, and replaying it would insert them again
+SHEETS_API_RETRIES = 5
+# Longest wait between throttled write attempts, in seconds
+SHEETS_MAX_BACKOFF = 32
+
+# Seconds a spreadsheet's tab metadata is reused before it is fetched again
+SHEET_METADATA_TTL = 30
+
+
+def _retry_after_seconds(error: HttpError) -> Optional[float]:
+    """
+    Read the Retry-After header of a throttled response.
+    
+    Args:
+        error (HttpError): The 429 error raised by googleapiclient.
+        
+    Returns:
+        float: Seconds to wait, or None if the header is missing or unreadable.
+    """
+    retry_after = error.resp.get('retry-after')
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
 
 class SheetCustomizer:
     """Customizes Google Sheets based on parsed Jira ticket data."""
@@ -20,6 +61,8 @@ class SheetCustomizer:
         """Initialize the sheet customizer."""
         self.auth_manager = GoogleAuthManager()
         self.sheets_service = None
+        # Tab metadata by spreadsheet ID; dropped whenever this customizer deletes tabs
+        self._sheets_cache = TTLCache(maxsize=256, ttl=SHEET_METADATA_TTL)
     
     def initialize_service(self):
         """Initialize Google Sheets service."""
@@ -27,7 +70,124 @@ class SheetCustomizer:
             self.sheets_service = self.auth_manager.get_sheets_service()
         logger.info("Google Sheets service initialized for customization")
     
-    def customize_sheet_with_goals(self, sheet_id: str, tab_name: str, goals: List[str]) -> int:
+    def customize_qa_test_plan(self, sheet_id: str, platform_tab: str, goals: List[str],
+                               custom_attributes: Optional[List[str]] = None,
+                               custom_attributes_start_row: int = 34) -> int:
+        """
+        Apply every customization to a new QA test plan in one round trip.
+        
+        Goals, custom attributes and platform tab pruning are built from a single
+        metadata fetch and sent as one batchUpdate. Sheets applies the requests in
+        order, so the custom attribute rows account for the rows the goals inserted.
+        A throttled (429) batch is retried with backoff. If the batch is rejected as
+        invalid, or stays throttled, the steps are applied one at a time so a failing
+        step does not block the others; a 5xx is raised, since the batch may have landed.
+        
+        Args:
+            sheet_id (str): ID of the Google Sheet to customize.
+            platform_tab (str): Platform tab to fill and keep (e.g., "[Optimizely] QA Pass 1").
+            goals (list): List of goal strings to insert.
+            custom_attributes (list, optional): List of custom attribute strings to insert.
+            custom_attributes_start_row (int): Template row of the custom attributes placeholder,
+                before any goal rows are inserted (default: 34).
+            
+        Returns:
+            int: Number of additional rows inserted for goals (beyond placeholder capacity).
+            
+        Raises:
+            Exception: If the sheet metadata cannot be read or the platform tab is missing.
+        """
+        self.initialize_service()
+        logger.info("Customizing sheet %s for %s in one batch", sheet_id, platform_tab)
+        
+        # Filter out empty goals and custom attributes
+        goals = [g.strip() for g in goals or [] if g.strip()]
+        custom_attributes = [ca.strip() for ca in custom_attributes or [] if ca.strip()]
+        
+        sheets = self._get_sheets(sheet_id)
+        
+        requests = []
+        goals_rows_inserted = 0
+        if goals or custom_attributes:
+            tab_name, tab_id = self._resolve_tab(sheets, platform_tab)
+            if tab_id is None:
+                # Clearly report available tabs to guide template updates
+                self._raise_tab_not_found(sheets, platform_tab)
+            
+            if goals:
+                goal_requests, _, goals_rows_inserted = self._build_goals_requests(tab_id, tab_name, goals)
+                requests.extend(goal_requests)
+            if custom_attributes:
+                # Rows inserted for goals shift the custom attributes placeholder down
+                start_row = custom_attributes_start_row + goals_rows_inserted
+                requests.extend(self._build_custom_attributes_requests(tab_id, tab_name, custom_attributes, start_row))
+        
+        requests.extend(self._build_prune_requests(sheets, platform_tab))
+        
+        if not requests:
+            logger.info("Nothing to customize; sheet left as copied")
+            return 0
+        
+        try:
+            self._execute_write(self.sheets_service.spreadsheets().batchUpdate(
+                spreadsheetId=sheet_id,
+                body={'requests': requests}
+            ))
+        except HttpError as e:
+            if e.resp.status >= 500:
+                # Failed server-side: the batch may or may not have been applied, so
+                # replaying its steps could insert rows twice
+                self._sheets_cache.pop(sheet_id)
+                logger.error("Combined customization of sheet %s failed with status %s; not retrying: %s",
+                             sheet_id, e.resp.status, e)
+                raise
+            logger.warning("Combined customization of sheet %s failed, applying steps one at a time: %s", sheet_id, e)
+            # Sheets rejected the batch (as invalid, or throttled past every retry)
+            # without applying any of it, so the fetched metadata is still current
+            return self._customize_step_by_step(sheet_id, platform_tab, goals, custom_attributes,
+                                                custom_attributes_start_row, sheets)
+        
+        if any('deleteSheet' in r for r in requests):
+            self._sheets_cache.pop(sheet_id)
+        
+        logger.info("Customized sheet %s with %s goals and %s custom attributes in one batchUpdate", sheet_id, len(goals), len(custom_attributes))
+        return goals_rows_inserted
+    
+    def _customize_step_by_step(self, sheet_id: str, platform_tab: str, goals: List[str],
+                                custom_attributes: List[str], custom_attributes_start_row: int,
+                                sheets: list) -> int:
+        """
+        Apply goals, custom attributes and pruning as separate batchUpdates, logging failures.
+        
+        Returns:
+            int: Number of additional rows inserted for goals.
+        """
+        goals_rows_inserted = 0
+        if goals:
+            try:
+                goals_rows_inserted = self.customize_sheet_with_goals(sheet_id, platform_tab, goals, sheets=sheets)
+            except Exception as e:
+                logger.error("Failed to customize sheet with goals: %s", e)
+        
+        if custom_attributes:
+            try:
+                self.customize_sheet_with_custom_attributes(
+                    sheet_id, platform_tab, custom_attributes,
+                    start_row=custom_attributes_start_row + goals_rows_inserted,
+                    sheets=sheets
+                )
+            except Exception as e:
+                logger.error("Failed to customize sheet with custom attributes: %s", e)
+        
+        try:
+            self.prune_platform_tabs(sheet_id, platform_tab, sheets=sheets)
+        except Exception as e:
+            logger.error("Failed to prune platform tabs: %s", e)
+        
+        return goals_rows_inserted
+    
+    def customize_sheet_with_goals(self, sheet_id: str, tab_name: str, goals: List[str],
+                                   sheets: Optional[list] = None) -> int:
         """
         Customize a sheet by inserting goals into the specified tab.
         
@@ -35,6 +195,7 @@ class SheetCustomizer:
             sheet_id (str): ID of the Google Sheet to customize.
             tab_name (str): Name of the tab to customize (e.g., "[Optimizely] QA Pass 1").
             goals (list): List of goal strings to insert.
+            sheets (list, optional): Already-fetched 'sheets' metadata. Fetched if not provided.
             
         Returns:
             int: Number of additional rows inserted (beyond placeholder capacity).
@@ -44,7 +205,7 @@ class SheetCustomizer:
         """
         try:
             self.initialize_service()
-            logger.info(f"Starting customization of sheet {sheet_id}, tab: {tab_name}")
+            logger.info("Starting customization of sheet %s, tab: %s", sheet_id, tab_name)
             
             if not goals:
                 logger.info("No goals to insert, skipping customization")
@@ -56,118 +217,31 @@ class SheetCustomizer:
                 logger.info("No non-empty goals after filtering, skipping customization")
                 return 0
             
-            # Find the tab ID; if missing, try to resolve by token only (no auto-creation)
-            tab_id = self._get_tab_id(sheet_id, tab_name)
+            # Find the tab by title, else by platform token (no auto-creation), from one metadata fetch
+            if sheets is None:
+                sheets = self._get_sheets(sheet_id)
+            tab_name, tab_id = self._resolve_tab(sheets, tab_name)
             if tab_id is None:
-                # Try token-based resolution (e.g., "[Monetate]")
-                token = self._extract_platform_token(tab_name)
-                if token:
-                    resolved_title, resolved_id = self._find_platform_tab_by_token(sheet_id, token)
-                    if resolved_id is not None:
-                        logger.info(f"Resolved requested tab '{tab_name}' to existing tab '{resolved_title}' (id={resolved_id})")
-                        tab_name = resolved_title
-                        tab_id = resolved_id
-                
-            if tab_id is None:
-                # Still not found — clearly report available tabs to guide template updates
-                available_titles = self._list_tab_titles(sheet_id)
-                logger.error(
-                    f"Tab '{tab_name}' not found in sheet; available tabs: {available_titles}"
-                )
-                raise Exception(f"Tab '{tab_name}' not found in sheet")
-            
-            # Determine starting row per platform
-            platform_token = self._extract_platform_token(tab_name).lower()
-            start_row_by_platform = {
-                '[monetate]': 23,
-                '[vwo]': 26,
-                '[convert]': 27,
-                '[optimizely]': 28,
-            }
-            start_row = start_row_by_platform.get(platform_token, 28)
-            num_goals = len(goals)
-            placeholder_capacity = 3  # existing placeholder rows in each platform tab
-            rows_to_insert = max(0, num_goals - placeholder_capacity)
-            logger.info(
-                f"Preparing space for {num_goals} goals at row {start_row} with {placeholder_capacity} placeholders; inserting {rows_to_insert} additional row(s)"
-            )
-            
-            # Insert only rows beyond placeholder capacity
-            if rows_to_insert > 0:
-                requests = [{
-                    'insertDimension': {
-                        'range': {
-                            'sheetId': tab_id,
-                            'dimension': 'ROWS',
-                            'startIndex': (start_row - 1) + placeholder_capacity,
-                            'endIndex': (start_row - 1) + placeholder_capacity + rows_to_insert
-                        }
-                    }
-                }]
-                self.sheets_service.spreadsheets().batchUpdate(
-                    spreadsheetId=sheet_id,
-                    body={'requests': requests}
-                ).execute()
-                logger.info(f"Inserted {rows_to_insert} additional row(s) after placeholders")
-            else:
-                logger.info("No additional rows inserted; placeholders cover all goals")
+                # Not found — clearly report available tabs to guide template updates
+                self._raise_tab_not_found(sheets, tab_name)
             
-            # Copy formats, formulas, and validations from the template row (start_row)
-            # into the C:L columns for all goal rows so columns behave as expected
-            copy_source = {
-                'sheetId': tab_id,
-                'startRowIndex': start_row - 1,
-                'endRowIndex': start_row,  # single row
-                'startColumnIndex': 2,     # column C (0-based)
-                'endColumnIndex': 12       # column L exclusive
-            }
-            copy_destination = {
-                'sheetId': tab_id,
-                'startRowIndex': start_row - 1,
-                'endRowIndex': start_row - 1 + num_goals,
-                'startColumnIndex': 2,
-                'endColumnIndex': 12
-            }
-
-            copy_requests = [
-                { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_FORMAT', 'pasteOrientation': 'NORMAL' } },
-                { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_DATA_VALIDATION', 'pasteOrientation': 'NORMAL' } },
-                { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_CONDITIONAL_FORMATTING', 'pasteOrientation': 'NORMAL' } },
-                { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_FORMULA', 'pasteOrientation': 'NORMAL' } },
-            ]
-
-            self.sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=sheet_id,
-                body={'requests': copy_requests}
-            ).execute()
-            logger.info("Copied C:L formats/validations/formulas to goal rows")
+            requests, start_row, rows_to_insert = self._build_goals_requests(tab_id, tab_name, goals)
 
-            # Now insert the goal content into Column B
-            range_name = f"'{tab_name}'!B{start_row}:B{start_row + num_goals - 1}"
-            logger.info(f"Inserting goal content into {range_name}")
-            
-            # Prepare the values - each goal goes into its own row
-            values = [[goal] for goal in goals]
-            
-            body = {
-                'values': values
-            }
-            
-            self.sheets_service.spreadsheets().values().update(
+            self._execute_write(self.sheets_service.spreadsheets().batchUpdate(
                 spreadsheetId=sheet_id,
-                range=range_name,
-                valueInputOption='RAW',
-                body=body
-            ).execute()
+                body={'requests': requests}
+            ))
+            logger.info("Inserted rows, copied C:L formats/validations/formulas and wrote goal content to goal rows")
             
-            logger.info(f"Successfully inserted {num_goals} goals into {tab_name} starting at row {start_row}")
+            logger.info("Successfully inserted %s goals into %s starting at row %s", len(goals), tab_name, start_row)
             return rows_to_insert
             
         except Exception as e:
-            logger.error(f"Failed to customize sheet {sheet_id}: {e}")
+            logger.error("Failed to customize sheet %s: %s", sheet_id, e)
             raise
     
-    def customize_sheet_with_custom_attributes(self, sheet_id: str, tab_name: str, custom_attributes: List[str], start_row: int = 34) -> bool:
+    def customize_sheet_with_custom_attributes(self, sheet_id: str, tab_name: str, custom_attributes: List[str], start_row: int = 34,
+                                               sheets: Optional[list] = None) -> bool:
         """
         Customize a sheet by inserting custom attributes into the specified tab.
         
@@ -179,6 +253,7 @@ class SheetCustomizer:
             tab_name (str): Name of the tab to customize (e.g., "[Optimizely] QA Pass 1").
             custom_attributes (list): List of custom attribute strings to insert.
             start_row (int): Starting row number (default: 34 for Custom attributes).
+            sheets (list, optional): Already-fetched 'sheets' metadata. Fetched if not provided.
             
         Returns:
             bool: True if customization was successful.
@@ -188,11 +263,11 @@ class SheetCustomizer:
         """
         try:
             self.initialize_service()
-            logger.info(f"Starting custom attributes customization of sheet {sheet_id}, tab: {tab_name}, start_row: {start_row}")
+            logger.info("Starting custom attributes customization of sheet %s, tab: %s, start_row: %s", sheet_id, tab_name, start_row)
             
             # Validate start_row
             if start_row < 1:
-                logger.warning(f"Invalid start_row {start_row}, using default 34")
+                logger.warning("Invalid start_row %s, using default 34", start_row)
                 start_row = 34
             
             if not custom_attributes:
@@ -205,165 +280,392 @@ class SheetCustomizer:
                 logger.info("No non-empty custom attributes after filtering, skipping customization")
                 return True
             
-            # Find the tab ID; if missing, try to resolve by token only (no auto-creation)
-            tab_id = self._get_tab_id(sheet_id, tab_name)
-            if tab_id is None:
-                # Try token-based resolution (e.g., "[Optimizely]")
-                token = self._extract_platform_token(tab_name)
-                if token:
-                    resolved_title, resolved_id = self._find_platform_tab_by_token(sheet_id, token)
-                    if resolved_id is not None:
-                        logger.info(f"Resolved requested tab '{tab_name}' to existing tab '{resolved_title}' (id={resolved_id})")
-                        tab_name = resolved_title
-                        tab_id = resolved_id
-                
+            # Find the tab by title, else by platform token (no auto-creation), from one metadata fetch
+            if sheets is None:
+                sheets = self._get_sheets(sheet_id)
+            tab_name, tab_id = self._resolve_tab(sheets, tab_name)
             if tab_id is None:
-                # Still not found — clearly report available tabs to guide template updates
-                available_titles = self._list_tab_titles(sheet_id)
-                logger.error(
-                    f"Tab '{tab_name}' not found in sheet; available tabs: {available_titles}"
-                )
-                raise Exception(f"Tab '{tab_name}' not found in sheet")
+                # Not found — clearly report available tabs to guide template updates
+                self._raise_tab_not_found(sheets, tab_name)
             
-            # Warn if not Optimizely tab (but still proceed)
-            platform_token = self._extract_platform_token(tab_name).lower()
-            if '[optimizely]' not in platform_token:
-                logger.warning(f"Custom attributes should only be used for Optimizely tabs, but tab is: {tab_name}")
+            requests = self._build_custom_attributes_requests(tab_id, tab_name, custom_attributes, start_row)
+
+            self._execute_write(self.sheets_service.spreadsheets().batchUpdate(
+                spreadsheetId=sheet_id,
+                body={'requests': requests}
+            ))
+            logger.info("Inserted rows, copied C:L formats/validations/formulas and wrote custom attribute content")
             
-            num_attributes = len(custom_attributes)
-            # Custom attributes template has only 1 placeholder row (row 34 in template)
-            # Row 35 is empty, row 36 is Screenshots (not a placeholder)
-            # So we only have 1 placeholder row, not 3 like Goals
-            placeholder_capacity = 1  # Only row 34 (start_row) is the template placeholder
-            # Calculate how many rows we need to insert beyond the placeholder capacity
-            rows_to_insert = max(0, num_attributes - placeholder_capacity)
-            logger.info(
-                f"Preparing space for {num_attributes} custom attributes at row {start_row} with {placeholder_capacity} placeholders; inserting {rows_to_insert} additional row(s)"
-            )
+            logger.info("Successfully inserted %s custom attributes into %s starting at row %s", len(custom_attributes), tab_name, start_row)
+            return True
             
-            # CRITICAL FIX: Insert rows starting right after the template row to shift content below
-            # Template structure: row 34 = template, row 35 = empty, row 36 = Screenshots
-            # After Goals insertion: row 34→40, row 35→41, row 36→42 (Screenshots)
-            # We need to insert rows starting at row 41 (after the template at row 40) to shift
-            # Screenshots (row 42) and all content below down BEFORE we write Custom attributes
-            if rows_to_insert > 0:
-                # Insert rows starting right after the template row (start_row + placeholder_capacity)
-                # This shifts Screenshots (row 42) and all content below down BEFORE we write
-                # Example: start_row=40, placeholder_capacity=1, so insert at index 40 (row 41)
-                # This shifts row 41+ (including Screenshots at row 42) down by rows_to_insert
-                # Then we write Custom attributes to rows 40-48
-                insert_start_index = (start_row - 1) + placeholder_capacity  # 0-based index (row 41)
-                insert_end_index = insert_start_index + rows_to_insert
-                
-                requests = [{
-                    'insertDimension': {
-                        'range': {
-                            'sheetId': tab_id,
-                            'dimension': 'ROWS',
-                            'startIndex': insert_start_index,
-                            'endIndex': insert_end_index
-                        }
-                    }
-                }]
-                self.sheets_service.spreadsheets().batchUpdate(
-                    spreadsheetId=sheet_id,
-                    body={'requests': requests}
-                ).execute()
-                logger.info(f"Inserted {rows_to_insert} additional row(s) starting at index {insert_start_index} (row {insert_start_index + 1}) to shift content below before writing custom attributes")
-            else:
-                logger.info("No additional rows inserted; placeholders cover all custom attributes")
+        except Exception as e:
+            logger.error("Failed to customize sheet %s with custom attributes: %s", sheet_id, e)
+            raise
+    
+    def _build_goals_requests(self, tab_id: int, tab_name: str, goals: List[str]):
+        """
+        Build the batchUpdate requests that insert goals into a platform tab.
+        
+        Args:
+            tab_id (int): ID of the resolved platform tab.
+            tab_name (str): Title of the resolved platform tab.
+            goals (list): Non-empty goal strings to insert.
             
-            # Copy formats, formulas, and validations from the template row (start_row)
-            # into the C:L columns for all custom attribute rows so columns behave as expected
-            copy_source = {
-                'sheetId': tab_id,
-                'startRowIndex': start_row - 1,
-                'endRowIndex': start_row,  # single row
-                'startColumnIndex': 2,     # column C (0-based)
-                'endColumnIndex': 12       # column L exclusive
-            }
-            copy_destination = {
-                'sheetId': tab_id,
-                'startRowIndex': start_row - 1,
-                'endRowIndex': start_row - 1 + num_attributes,
-                'startColumnIndex': 2,
-                'endColumnIndex': 12
-            }
+        Returns:
+            tuple: (requests, start_row, rows_to_insert) - the requests to send, the row
+                the first goal is written to, and the number of additional rows inserted.
+        """
+        # Determine starting row per platform
+        platform_token = self._extract_platform_token(tab_name).lower()
+        start_row_by_platform = {
+            '[monetate]': 23,
+            '[vwo]': 26,
+            '[convert]': 27,
+            '[optimizely]': 28,
+        }
+        start_row = start_row_by_platform.get(platform_token, 28)
+        num_goals = len(goals)
+        placeholder_capacity = 3  # existing placeholder rows in each platform tab
+        rows_to_insert = max(0, num_goals - placeholder_capacity)
+        logger.info(
+            "Preparing space for %s goals at row %s with %s placeholders; inserting %s additional row(s)",
+            num_goals, start_row, placeholder_capacity, rows_to_insert
+        )
+        
+        # Row insertion and template copying are sent together in one batchUpdate;
+        # Sheets applies the requests in order, so the copy sees the inserted rows
+        requests = []
+        
+        # Insert only rows beyond placeholder capacity
+        if rows_to_insert > 0:
+            requests.append({
+                'insertDimension': {
+                    'range': {
+                        'sheetId': tab_id,
+                        'dimension': 'ROWS',
+                        'startIndex': (start_row - 1) + placeholder_capacity,
+                        'endIndex': (start_row - 1) + placeholder_capacity + rows_to_insert
+                    }
+                }
+            })
+            logger.info("Inserting %s additional row(s) after placeholders", rows_to_insert)
+        else:
+            logger.info("No additional rows inserted; placeholders cover all goals")
+        
+        # Copy formats, formulas, and validations from the template row (start_row)
+        # into the C:L columns for all goal rows so columns behave as expected
+        copy_source = {
+            'sheetId': tab_id,
+            'startRowIndex': start_row - 1,
+            'endRowIndex': start_row,  # single row
+            'startColumnIndex': 2,     # column C (0-based)
+            'endColumnIndex': 12       # column L exclusive
+        }
+        copy_destination = {
+            'sheetId': tab_id,
+            'startRowIndex': start_row - 1,
+            'endRowIndex': start_row - 1 + num_goals,
+            'startColumnIndex': 2,
+            'endColumnIndex': 12
+        }
 
-            copy_requests = [
-                { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_FORMAT', 'pasteOrientation': 'NORMAL' } },
-                { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_DATA_VALIDATION', 'pasteOrientation': 'NORMAL' } },
-                { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_CONDITIONAL_FORMATTING', 'pasteOrientation': 'NORMAL' } },
-                { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_FORMULA', 'pasteOrientation': 'NORMAL' } },
-            ]
+        requests.extend([
+            { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_FORMAT', 'pasteOrientation': 'NORMAL' } },
+            { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_DATA_VALIDATION', 'pasteOrientation': 'NORMAL' } },
+            { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_CONDITIONAL_FORMATTING', 'pasteOrientation': 'NORMAL' } },
+            { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_FORMULA', 'pasteOrientation': 'NORMAL' } },
+        ])
 
-            self.sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=sheet_id,
-                body={'requests': copy_requests}
-            ).execute()
-            logger.info("Copied C:L formats/validations/formulas to custom attribute rows")
+        # Then write the goal content into Column B, one goal per row
+        requests.append(self._build_column_b_text_request(tab_id, start_row, goals))
+        
+        return requests, start_row, rows_to_insert
+    
+    def _build_custom_attributes_requests(self, tab_id: int, tab_name: str, custom_attributes: List[str], start_row: int) -> list:
+        """
+        Build the batchUpdate requests that insert custom attributes into a platform tab.
+        
+        Args:
+            tab_id (int): ID of the resolved platform tab.
+            tab_name (str): Title of the resolved platform tab.
+            custom_attributes (list): Non-empty custom attribute strings to insert.
+            start_row (int): Row the first custom attribute is written to.
+            
+        Returns:
+            list: The requests to send.
+        """
+        # Warn if not Optimizely tab (but still proceed)
+        platform_token = self._extract_platform_token(tab_name).lower()
+        if '[optimizely]' not in platform_token:
+            logger.warning("Custom attributes should only be used for Optimizely tabs, but tab is: %s", tab_name)
+        
+        num_attributes = len(custom_attributes)
+        # Custom attributes template has only 1 placeholder row (row 34 in template)
+        # Row 35 is empty, row 36 is Screenshots (not a placeholder)
+        # So we only have 1 placeholder row, not 3 like Goals
+        placeholder_capacity = 1  # Only row 34 (start_row) is the template placeholder
+        # Calculate how many rows we need to insert beyond the placeholder capacity
+        rows_to_insert = max(0, num_attributes - placeholder_capacity)
+        logger.info(
+            "Preparing space for %s custom attributes at row %s with %s placeholders; inserting %s additional row(s)",
+            num_attributes, start_row, placeholder_capacity, rows_to_insert
+        )
+        
+        # CRITICAL FIX: Insert rows starting right after the template row to shift content below
+        # Template structure: row 34 = template, row 35 = empty, row 36 = Screenshots
+        # After Goals insertion: row 34→40, row 35→41, row 36→42 (Screenshots)
+        # We need to insert rows starting at row 41 (after the template at row 40) to shift
+        # Screenshots (row 42) and all content below down BEFORE we write Custom attributes
+        # Row insertion and template copying are sent together in one batchUpdate;
+        # Sheets applies the requests in order, so the copy sees the inserted rows
+        requests = []
+        
+        if rows_to_insert > 0:
+            # Insert rows starting right after the template row (start_row + placeholder_capacity)
+            # This shifts Screenshots (row 42) and all content below down BEFORE we write
+            # Example: start_row=40, placeholder_capacity=1, so insert at index 40 (row 41)
+            # This shifts row 41+ (including Screenshots at row 42) down by rows_to_insert
+            # Then we write Custom attributes to rows 40-48
+            insert_start_index = (start_row - 1) + placeholder_capacity  # 0-based index (row 41)
+            insert_end_index = insert_start_index + rows_to_insert
+            
+            requests.append({
+                'insertDimension': {
+                    'range': {
+                        'sheetId': tab_id,
+                        'dimension': 'ROWS',
+                        'startIndex': insert_start_index,
+                        'endIndex': insert_end_index
+                    }
+                }
+            })
+            logger.info("Inserting %s additional row(s) starting at index %s (row %s) to shift content below before writing custom attributes", rows_to_insert, insert_start_index, insert_start_index + 1)
+        else:
+            logger.info("No additional rows inserted; placeholders cover all custom attributes")
+        
+        # Copy formats, formulas, and validations from the template row (start_row)
+        # into the C:L columns for all custom attribute rows so columns behave as expected
+        copy_source = {
+            'sheetId': tab_id,
+            'startRowIndex': start_row - 1,
+            'endRowIndex': start_row,  # single row
+            'startColumnIndex': 2,     # column C (0-based)
+            'endColumnIndex': 12       # column L exclusive
+        }
+        copy_destination = {
+            'sheetId': tab_id,
+            'startRowIndex': start_row - 1,
+            'endRowIndex': start_row - 1 + num_attributes,
+            'startColumnIndex': 2,
+            'endColumnIndex': 12
+        }
 
-            # Now insert the custom attribute content into Column B
-            range_name = f"'{tab_name}'!B{start_row}:B{start_row + num_attributes - 1}"
-            logger.info(f"Inserting custom attribute content into {range_name}")
+        requests.extend([
+            { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_FORMAT', 'pasteOrientation': 'NORMAL' } },
+            { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_DATA_VALIDATION', 'pasteOrientation': 'NORMAL' } },
+            { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_CONDITIONAL_FORMATTING', 'pasteOrientation': 'NORMAL' } },
+            { 'copyPaste': { 'source': copy_source, 'destination': copy_destination, 'pasteType': 'PASTE_FORMULA', 'pasteOrientation': 'NORMAL' } },
+        ])
+
+        # Then write the custom attribute content into Column B, one attribute per row
+        requests.append(self._build_column_b_text_request(tab_id, start_row, custom_attributes))
+        
+        return requests
+    
+    def _build_prune_requests(self, sheets: list, selected_platform_tab: str) -> list:
+        """
+        Build the deleteSheet requests that prune all platform tabs except the selected one.
+        
+        Args:
+            sheets (list): The spreadsheet's 'sheets' metadata.
+            selected_platform_tab (str): The tab title to keep, e.g., "[Optimizely] QA Pass 1".
             
-            # Prepare the values - each custom attribute goes into its own row
-            values = [[attr] for attr in custom_attributes]
+        Returns:
+            list: The requests to send; empty if there is nothing to delete or the selected
+                  platform tab does not exist (so pruning never deletes every platform tab).
+        """
+        # Never delete the selected platform tab or the Complexity & Risk tab
+        keep_titles = {selected_platform_tab, "Complexity & Risk"}
+
+        # Nothing to prune without a platform, or once only the kept tabs remain
+        # (e.g., the sheet was already customized)
+        if not selected_platform_tab or all(
+            sheet.get('properties', {}).get('title') in keep_titles for sheet in sheets
+        ):
+            return []
+
+        # Derive a robust identifier for the selected platform
+        selected_lower = selected_platform_tab.lower()
+        selected_token = next((token for token in PLATFORM_TOKENS if token in selected_lower), None)
+
+        # Lowercase every title once; the checks below only compare lowercase strings
+        tabs = []
+        for sheet in sheets:
+            props = sheet.get('properties', {})
+            title = props.get('title', '')
+            tabs.append((title, title.lower(), props.get('sheetId')))
+
+        # Determine if the selected platform tab actually exists; if not, skip pruning
+        selected_exists = any(
+            title == selected_platform_tab or (selected_token and selected_token in title_lower)
+            for title, title_lower, _ in tabs
+        )
+
+        if not selected_exists:
+            logger.warning(
+                "Selected platform tab '%s' not found; skipping platform tab pruning to avoid deleting all tabs",
+                selected_platform_tab
+            )
+            return []
+
+        delete_requests = []
+        for title, title_lower, sheet_id_to_delete in tabs:
+            if title in keep_titles:
+                continue
+
+            # Delete any other platform tabs we recognize via token matching
+            is_platform_tab = any(token in title_lower for token in PLATFORM_TOKENS)
+            is_selected_platform_tab = selected_token and selected_token in title_lower
+
+            if is_platform_tab and not is_selected_platform_tab:
+                logger.info("Scheduling deletion of tab '%s' (id=%s)", title, sheet_id_to_delete)
+                delete_requests.append({
+                    'deleteSheet': {
+                        'sheetId': sheet_id_to_delete
+                    }
+                })
+
+        return delete_requests
+    
+    def _build_column_b_text_request(self, tab_id: int, start_row: int, texts: List[str]) -> dict:
+        """
+        Build an updateCells request writing one text per row into Column B.
+        
+        Values are stored as plain strings, like a RAW values().update, so the write can
+        ride in the same batchUpdate as the row insertion and template copying.
+        
+        Args:
+            tab_id (int): The tab ID.
+            start_row (int): 1-based row of the first text.
+            texts (list): Cell texts, written top to bottom.
             
-            body = {
-                'values': values
+        Returns:
+            dict: The updateCells request.
+        """
+        return {
+            'updateCells': {
+                'start': {
+                    'sheetId': tab_id,
+                    'rowIndex': start_row - 1,
+                    'columnIndex': 1  # column B (0-based)
+                },
+                'rows': [{'values': [{'userEnteredValue': {'stringValue': text}}]} for text in texts],
+                'fields': 'userEnteredValue'
             }
+        }
+    
+    def _resolve_tab(self, sheets: list, tab_name: str):
+        """
+        Find a tab in already-fetched metadata by exact title, else by its platform token.
+        
+        Args:
+            sheets (list): The spreadsheet's 'sheets' metadata.
+            tab_name (str): The requested tab title (e.g., "[Optimizely] QA Pass 1").
             
-            self.sheets_service.spreadsheets().values().update(
-                spreadsheetId=sheet_id,
-                range=range_name,
-                valueInputOption='RAW',
-                body=body
-            ).execute()
+        Returns:
+            tuple: (title, tab ID) of the matching tab, or (tab_name, None) if none matches.
+        """
+        # One pass: an exact title wins; otherwise fall back to the first tab carrying
+        # the platform token (e.g., "[Monetate]"); no auto-creation
+        token = self._extract_platform_token(tab_name)
+        token_lower = token.lower() if token else None
+        token_match = None
+        for sheet in sheets:
+            sheet_props = sheet.get('properties', {})
+            title = sheet_props.get('title', '')
+            if title == tab_name:
+                return tab_name, sheet_props.get('sheetId')
+            if token_match is None and token_lower and token_lower in title.lower():
+                token_match = sheet_props
+        
+        if token_match is not None:
+            title = token_match.get('title', '')
+            logger.info("Resolved requested tab '%s' to existing tab '%s' (id=%s)", tab_name, title, token_match.get('sheetId'))
+            return title, token_match.get('sheetId')
+        
+        return tab_name, None
+    
+    def _execute_write(self, request):
+        """
+        Execute a Sheets write, retrying it while Sheets answers 429 Too Many Requests.
+        
+        Waits for the response's Retry-After when given, else backs off exponentially
+        with jitter. Other errors are raised immediately, since the write may have
+        been applied.
+        
+        Args:
+            request (HttpRequest): The prepared write request.
             
-            logger.info(f"Successfully inserted {num_attributes} custom attributes into {tab_name} starting at row {start_row}")
-            return True
+        Returns:
+            dict: The API response.
             
-        except Exception as e:
-            logger.error(f"Failed to customize sheet {sheet_id} with custom attributes: {e}")
-            raise
+        Raises:
+            HttpError: If the write fails, or is still throttled after SHEETS_API_RETRIES retries.
+        """
+        for attempt in range(SHEETS_API_RETRIES + 1):
+            try:
+                return request.execute()
+            except HttpError as e:
+                if e.resp.status != 429 or attempt == SHEETS_API_RETRIES:
+                    raise
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    delay = 2 ** attempt + random.random()
+                delay = min(delay, SHEETS_MAX_BACKOFF)
+                logger.warning("Sheets write throttled (429), retrying in %.1fs (attempt %s of %s)",
+                               delay, attempt + 1, SHEETS_API_RETRIES)
+                time.sleep(delay)
     
-    def _get_tab_id(self, sheet_id: str, tab_name: str) -> int:
+    def _get_sheets(self, sheet_id: str) -> list:
         """
-        Get the tab ID for a given tab name.
+        Fetch the tab metadata of a spreadsheet, reusing a copy fetched in the last
+        SHEET_METADATA_TTL seconds.
         
         Args:
             sheet_id (str): The spreadsheet ID.
-            tab_name (str): The name of the tab.
             
         Returns:
-            int: The tab ID, or None if not found.
+            list: The spreadsheet's 'sheets' metadata (each with 'properties' holding
+                  only 'sheetId' and 'title').
         """
+        sheets = self._sheets_cache.get(sheet_id)
+        if sheets is not None:
+            return sheets
+        
         try:
-            logger.info(f"Looking for tab: {tab_name}")
-            
-            # Get spreadsheet metadata
+            # Only tab titles and IDs are read, so skip every other property
             spreadsheet = self.sheets_service.spreadsheets().get(
                 spreadsheetId=sheet_id,
-                includeGridData=False
-            ).execute()
-            
+                includeGridData=False,
+                fields='sheets.properties(sheetId,title)'
+            ).execute(num_retries=SHEETS_API_RETRIES)
             sheets = spreadsheet.get('sheets', [])
-            
-            # Find the matching tab
-            for sheet in sheets:
-                sheet_props = sheet.get('properties', {})
-                if sheet_props.get('title') == tab_name:
-                    tab_id = sheet_props.get('sheetId')
-                    logger.info(f"Found tab ID: {tab_id} for '{tab_name}'")
-                    return tab_id
-            
-            logger.error(f"Tab '{tab_name}' not found")
-            return None
+            self._sheets_cache.set(sheet_id, sheets)
+            return sheets
             
         except HttpError as e:
-            logger.error(f"Failed to get tab ID: {e}")
+            logger.error("Failed to get sheet metadata: %s", e)
             raise
+    
+    def _raise_tab_not_found(self, sheets: list, tab_name: str):
+        """Log the available tab titles and raise for a tab that does not exist."""
+        available_titles = [sheet.get('properties', {}).get('title', '') for sheet in sheets]
+        logger.error(
+            "Tab '%s' not found in sheet; available tabs: %s",
+            tab_name, available_titles
+        )
+        raise Exception(f"Tab '{tab_name}' not found in sheet")
 
     def _extract_platform_token(self, tab_title: str) -> str:
         """Return the bracketed platform token (e.g., "[Monetate]") from a tab title if present."""
@@ -378,26 +680,7 @@ class SheetCustomizer:
         except Exception:
             return ""
 
-    def _find_platform_tab_by_token(self, sheet_id: str, token: str):
-        """Find an existing tab whose title contains the given token (case-insensitive)."""
-        spreadsheet = self.sheets_service.spreadsheets().get(
-            spreadsheetId=sheet_id,
-            includeGridData=False
-        ).execute()
-        for sheet in spreadsheet.get('sheets', []):
-            title = sheet.get('properties', {}).get('title', '')
-            if token and token.lower() in title.lower():
-                return title, sheet.get('properties', {}).get('sheetId')
-        return None, None
-
-    def _list_tab_titles(self, sheet_id: str):
-        spreadsheet = self.sheets_service.spreadsheets().get(
-            spreadsheetId=sheet_id,
-            includeGridData=False
-        ).execute()
-        return [s.get('properties', {}).get('title', '') for s in spreadsheet.get('sheets', [])]
-
-    def prune_platform_tabs(self, sheet_id: str, selected_platform_tab: str) -> bool:
+    def prune_platform_tabs(self, sheet_id: str, selected_platform_tab: str, sheets: Optional[list] = None) -> bool:
         """
         Delete all platform-specific tabs except the selected one and always keep
         the "Complexity & Risk" tab.
@@ -405,94 +688,38 @@ class SheetCustomizer:
         Args:
             sheet_id (str): Spreadsheet ID.
             selected_platform_tab (str): The tab title to keep, e.g., "[Optimizely] QA Pass 1".
+            sheets (list, optional): Already-fetched 'sheets' metadata. Fetched if not provided.
         
         Returns:
             bool: True if pruning completed successfully (no-op counts as success).
         """
         try:
             self.initialize_service()
-            logger.info(f"Pruning platform tabs in sheet {sheet_id}; keeping '{selected_platform_tab}' and 'Complexity & Risk'")
-
-            # Known platform tokens and typical titles
-            platform_tokens = [
-                "[Optimizely]",
-                "[Convert]",
-                "[VWO]",
-                "[Monetate]",
-            ]
-
-            # Derive a robust identifier for the selected platform
-            selected_token = None
-            for token in platform_tokens:
-                if token.lower() in selected_platform_tab.lower():
-                    selected_token = token
-                    break
-
-            # Fetch spreadsheet metadata
-            spreadsheet = self.sheets_service.spreadsheets().get(
-                spreadsheetId=sheet_id,
-                includeGridData=False
-            ).execute()
-
-            sheets = spreadsheet.get('sheets', [])
-            delete_requests = []
-
-            # Determine if the selected platform tab actually exists; if not, skip pruning
-            selected_exists = False
-            for sheet in sheets:
-                title = sheet.get('properties', {}).get('title', '')
-                if title == selected_platform_tab or (
-                    selected_token and selected_token.lower() in title.lower()
-                ):
-                    selected_exists = True
-                    break
-
-            if not selected_exists:
-                logger.warning(
-                    f"Selected platform tab '{selected_platform_tab}' not found; skipping platform tab pruning to avoid deleting all tabs"
-                )
-                return True
+            logger.info("Pruning platform tabs in sheet %s; keeping '%s' and 'Complexity & Risk'", sheet_id, selected_platform_tab)
 
-            for sheet in sheets:
-                props = sheet.get('properties', {})
-                title = props.get('title')
-                sheet_id_to_delete = props.get('sheetId')
+            # Fetch spreadsheet metadata unless the caller already has it
+            if sheets is None:
+                sheets = self._get_sheets(sheet_id)
 
-                # Never delete the selected platform tab or the Complexity & Risk tab
-                if title == selected_platform_tab or title == "Complexity & Risk":
-                    continue
-
-                # Delete any other platform tabs we recognize via token matching
-                is_platform_tab = any(token.lower() in title.lower() for token in platform_tokens)
-                is_selected_platform_tab = selected_token and (selected_token.lower() in title.lower())
-
-                if is_platform_tab and not is_selected_platform_tab:
-                    logger.info(f"Scheduling deletion of tab '{title}' (id={sheet_id_to_delete})")
-                    delete_requests.append({
-                        'deleteSheet': {
-                            'sheetId': sheet_id_to_delete
-                        }
-                    })
+            delete_requests = self._build_prune_requests(sheets, selected_platform_tab)
 
             if not delete_requests:
                 logger.info("No platform tabs to delete; pruning is a no-op")
                 return True
 
-            self.sheets_service.spreadsheets().batchUpdate(
+            self._execute_write(self.sheets_service.spreadsheets().batchUpdate(
                 spreadsheetId=sheet_id,
                 body={'requests': delete_requests}
-            ).execute()
+            ))
+            self._sheets_cache.pop(sheet_id)
 
-            logger.info(f"Successfully pruned {len(delete_requests)} platform tab(s)")
+            logger.info("Successfully pruned %s platform tab(s)", len(delete_requests))
             return True
 
         except HttpError as e:
-            logger.error(f"Failed to prune platform tabs: {e}")
+            logger.error("Failed to prune platform tabs: %s", e)
             raise Exception(f"Failed to prune platform tabs: {e}")
         except Exception as e:
-            logger.error(f"Unexpected error pruning platform tabs: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error getting tab ID: {e}")
+            logger.error("Unexpected error pruning platform tabs: %s", e)
             raise
 
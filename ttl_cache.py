@@ -0,0 +1,107 @@
+"""
+In-process TTL cache module.
+Keeps short-lived lookups (Jira issue state, sheet metadata) between requests.
+"""
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries; the oldest entry is evicted first.
+            ttl (float): Default number of seconds an entry stays valid.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for a key.
+
+        Args:
+            key: Cache key.
+            default: Value returned when the key is missing or expired.
+
+        Returns:
+            The cached value, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value for a key.
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+            ttl (float, optional): Seconds this entry stays valid. Uses the cache default if not provided.
+        """
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        """
+        Store a value only if the key has no live entry (like Redis SET NX).
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+            ttl (float, optional): Seconds this entry stays valid. Uses the cache default if not provided.
+
+        Returns:
+            bool: True if the value was stored, False if the key was already present.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def pop(self, key, default=None):
+        """
+        Remove a key and return its value.
+
+        Args:
+            key: Cache key.
+            default: Value returned when the key is missing.
+
+        Returns:
+            The removed value (even if expired), or default.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[0] if entry is not None else default
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key, value, ttl):
+        """Insert an entry, evicting expired or oldest entries when full. Caller holds the lock."""
+        # Re-insert so dict order tracks write order for eviction
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            now = time.monotonic()
+            for stale_key in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+                del self._entries[stale_key]
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))